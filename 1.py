@@ -1,8 +1,20 @@
 import time
 import random
 import sys
+import mmap as mmap_module
+import os
+import struct
+import tempfile
+import tracemalloc
+from collections import OrderedDict
+from array import array
 import matplotlib.pyplot as plt
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 sys.setrecursionlimit(20000)
 
 class Node:
@@ -10,53 +22,687 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        self.height = 1
+        # Расстояние (в ребрах) до ближайшего и самого дальнего листа поддерева
+        self.min_leaf = 0
+        self.max_leaf = 0
+
+def traverse(root, low=0, high=None, path=None):
+    """
+    Обход в глубину на явном стеке пар (узел, глубина): глубина дерева
+    ограничена только памятью, а не лимитом рекурсии. Генератор отдает
+    (leaf, depth, path) для каждого листа на глубине (в ребрах) из [low, high];
+    путь от корня - path[:depth + 1]. path - общий буфер не короче высоты
+    дерева (по умолчанию список), он действителен до следующего шага.
+    Поддеревья без листьев на нужных глубинах пропускаются по min_leaf/max_leaf.
+    """
+    if root is None:
+        return
+    if high is None:
+        high = root.max_leaf
+    if path is None:
+        path = [None] * (root.max_leaf + 1)
+    # Проверка глубин нужна, только если окно уже, чем глубины листьев дерева
+    prune = low > root.min_leaf or high < root.max_leaf
+    stack = [(root, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, depth = pop()
+        # Спуск по левой ветке идет без стека, туда попадают только правые дети
+        while True:
+            if prune and (depth + node.max_leaf < low or depth + node.min_leaf > high):
+                break
+            path[depth] = node.value
+            left, right = node.left, node.right
+            if left is None:
+                if right is None:
+                    yield node, depth, path
+                    break
+                node = right
+            else:
+                if right is not None:
+                    push((right, depth + 1))
+                node = left
+            depth += 1
+
+class QueryCache:
+    """
+    LRU-кэш результатов запросов к дереву. Ключ - (вид запроса, параметры).
+    Ответы привязаны к версии дерева: при любой вставке версия растет,
+    и при следующем обращении кэш целиком сбрасывается.
+    Сохраненные результаты отдаются как есть: функция запроса сама возвращает
+    наружу их полную копию, чтобы изменения результата не попадали в кэш.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, version, compute):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        result = compute()
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+def _build_balanced(values, start, end):
+    """
+    Строит идеально сбалансированное BST из отсортированного отрезка values[start..end]
+    за линейное время: середина отрезка становится корнем, половины - поддеревьями.
+    """
+    if start > end:
+        return None
+
+    mid = (start + end) // 2
+
+    node = Node(values[mid])
+    node.left = _build_balanced(values, start, mid - 1)
+    node.right = _build_balanced(values, mid + 1, end)
+    Tree._update(node)
+    return node
 
 class Tree:
-    def __init__(self):
+    def __init__(self, balanced=False, cache_size=128):
         self.root = None
         self.found_paths = []
+        self.version = 0
+        self.cache = QueryCache(cache_size)
+        # В сбалансированном режиме вставка выполняет AVL-повороты,
+        # и высота дерева остается O(log N) даже на отсортированных данных
+        self.balanced = balanced
+
+    @classmethod
+    def from_iterable(cls, values, presorted=False, balanced=False):
+        values = list(values) if presorted else sorted(values)
+        tree = cls(balanced=balanced)
+        tree.root = _build_balanced(values, 0, len(values) - 1)
+        return tree
 
     def add_node(self, value):
+        self.version += 1
+        if self.balanced:
+            self.root = self._add_avl(self.root, value)
+            return
+
         if self.root is None:
             self.root = Node(value)
+            return
+
+        path = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            current = current.left if value < current.value else current.right
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = Node(value)
         else:
-            self._add_recursion(self.root, value)
+            parent.right = Node(value)
+
+        # Глубины листьев меняются только у предков нового узла,
+        # и подъем прекращается на первом неизменившемся
+        for node in reversed(path):
+            if not self._update(node):
+                break
+
+    def _add_avl(self, node, value):
+        if node is None:
+            return Node(value)
+        if value < node.value:
+            node.left = self._add_avl(node.left, value)
+        else:
+            node.right = self._add_avl(node.right, value)
+        return self._rebalance(node)
+
+    @staticmethod
+    def _height(node):
+        return node.height if node is not None else 0
+
+    @staticmethod
+    def _update(node):
+        left, right = node.left, node.right
+        if left is None and right is None:
+            min_leaf = max_leaf = 0
+        elif left is None:
+            min_leaf, max_leaf = right.min_leaf + 1, right.max_leaf + 1
+        elif right is None:
+            min_leaf, max_leaf = left.min_leaf + 1, left.max_leaf + 1
+        else:
+            min_leaf = min(left.min_leaf, right.min_leaf) + 1
+            max_leaf = max(left.max_leaf, right.max_leaf) + 1
+
+        changed = min_leaf != node.min_leaf or max_leaf != node.max_leaf
+        node.min_leaf = min_leaf
+        node.max_leaf = max_leaf
+        node.height = max_leaf + 1
+        return changed
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def find_paths_range(self, a, b):
+        cached = self.cache.get_or_compute(
+            ('range', a, b), self.version, lambda: self._find_paths_range(a, b))
+        # Копируются и внешний список, и сами пути
+        self.found_paths = [list(path) for path in cached]
+        return self.found_paths
+
+    def _find_paths_range(self, a, b):
+        return [path[:depth + 1] for _, depth, path in traverse(self.root, a, b)]
 
-    def _add_recursion(self, current, value):
-        if value < current.value:
-            if current.left is None:
-                current.left = Node(value)
+    def find_paths_batch(self, queries):
+        """
+        Отвечает на пакет запросов за один обход дерева. Запросы:
+        ('length', a, b) - длина пути (в ребрах) в [a, b], ('exact', L) - длина ровно L,
+        ('sum', a, b) - сумма значений пути в [a, b]. Возвращает список ответов
+        в порядке запросов; лист, подходящий нескольким запросам, попадает
+        во все их ответы одним и тем же списком.
+        """
+        results = [[] for _ in queries]
+        exact = {}
+        length_ranges = []
+        sum_ranges = []
+        for i, query in enumerate(queries):
+            kind = query[0]
+            if kind == 'exact':
+                exact.setdefault(query[1], []).append(i)
+            elif kind == 'length':
+                length_ranges.append((query[1], query[2], i))
+            elif kind == 'sum':
+                sum_ranges.append((query[1], query[2], i))
             else:
-                self._add_recursion(current.left, value)
+                raise ValueError(f"Неизвестный вид запроса: {kind}")
+
+        if self.root is None or not queries:
+            return results
+
+        # Если запросы только по длине, поддеревья без листьев на нужных
+        # глубинах можно пропускать; суммовые запросы требуют полного обхода
+        if sum_ranges:
+            low, high = 0, None
         else:
-            if current.right is None:
-                current.right = Node(value)
+            bounds = [(a, b) for a, b, _ in length_ranges] + [(L, L) for L in exact]
+            low = min(a for a, _ in bounds)
+            high = max(b for _, b in bounds)
+
+        for _, depth, current_path in traverse(self.root, low, high):
+            path = current_path[:depth + 1]
+            matched = list(exact.get(depth, ()))
+            matched.extend(i for a, b, i in length_ranges if a <= depth <= b)
+            if sum_ranges:
+                path_sum = sum(path)
+                matched.extend(i for a, b, i in sum_ranges if a <= path_sum <= b)
+            for i in matched:
+                results[i].append(path)
+        return results
+
+    def iter_paths_range(self, a, b, copy=True):
+        """
+        Ленивая версия find_paths_range: пути отдаются по одному, не накапливаясь.
+        При copy=False каждый путь - memoryview на общий буфер array('q') без
+        копирования; он действителен только до следующего шага генератора,
+        а значения узлов должны помещаться в int64.
+        """
+        if self.root is None:
+            return
+        if copy:
+            for _, depth, path in traverse(self.root, a, b):
+                yield path[:depth + 1]
+            return
+
+        # Буфер сразу на всю высоту дерева: расширять его нельзя,
+        # пока на него ссылаются выданные memoryview
+        buffer = array('q', bytes(8 * (self.root.max_leaf + 1)))
+        view = memoryview(buffer)
+        for _, depth, _ in traverse(self.root, a, b, buffer):
+            yield view[:depth + 1]
+
+    def to_compact(self):
+        """Копия дерева в виде CompactTree, узлы пронумерованы в прямом порядке обхода"""
+        values, left, right = array('q'), array('q'), array('q')
+        stack = [(self.root, NIL, False)] if self.root is not None else []
+        while stack:
+            node, parent, is_right = stack.pop()
+            idx = len(values)
+            values.append(node.value)
+            left.append(NIL)
+            right.append(NIL)
+            if parent != NIL:
+                if is_right:
+                    right[parent] = idx
+                else:
+                    left[parent] = idx
+            if node.right is not None:
+                stack.append((node.right, idx, True))
+            if node.left is not None:
+                stack.append((node.left, idx, False))
+        return CompactTree.from_buffers(values, left, right, 0 if values else NIL)
+
+    def save(self, path):
+        """
+        Сохраняет дерево в двоичном виде: заголовок TREE_HEADER (сигнатура,
+        число узлов, индекс корня), затем массивы значений, левых и правых
+        потомков array('q') в прямом порядке обхода (NIL - нет потомка).
+        """
+        compact = self.to_compact()
+        with open(path, 'wb') as f:
+            f.write(TREE_HEADER.pack(TREE_MAGIC, len(compact.values), compact.root))
+            compact.values.tofile(f)
+            compact.left.tofile(f)
+            compact.right.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Читает файл, записанный save, и возвращает обычное дерево Tree
+        со всеми его запросами и кешем. Чтобы работать с файлом через mmap
+        без создания узлов, есть CompactTree.open_mmap.
+        """
+        with open(path, 'rb') as f:
+            count, root = _read_tree_header(f.read(TREE_HEADER.size))
+            values, left, right = array('q'), array('q'), array('q')
+            values.fromfile(f, count)
+            left.fromfile(f, count)
+            right.fromfile(f, count)
+
+        tree = cls()
+        nodes = [Node(v) for v in values]
+        # Дети в прямом порядке идут после родителя: проход с конца
+        # связывает узлы и пересчитывает их сводки снизу вверх
+        for i in range(count - 1, -1, -1):
+            node = nodes[i]
+            if left[i] != NIL:
+                node.left = nodes[left[i]]
+            if right[i] != NIL:
+                node.right = nodes[right[i]]
+            cls._update(node)
+        tree.root = nodes[root] if root != NIL else None
+        return tree
+
+NIL = -1
+
+TREE_MAGIC = b'TREE'
+TREE_HEADER = struct.Struct('=4s4xqq')
+
+def _read_tree_header(data):
+    magic, count, root = TREE_HEADER.unpack_from(data)
+    if magic != TREE_MAGIC:
+        raise ValueError("Файл не содержит сохраненного дерева")
+    return count, root
+
+class CompactTree:
+    """
+    Дерево без объектов Node: узлы лежат в параллельных массивах array('q')
+    (значение, индекс левого и правого потомка), NIL означает отсутствие потомка.
+    Индексы удаленных узлов попадают в список свободных ячеек и переиспользуются.
+    """
+    def __init__(self):
+        self.root = NIL
+        self.values = array('q')
+        self.left = array('q')
+        self.right = array('q')
+        self.free = array('q')
+        self.found_paths = []
+        self.mapped = None  # mmap, если массивы смотрят в файл (open_mmap)
+
+    @classmethod
+    def from_buffers(cls, values, left, right, root):
+        tree = cls()
+        tree.values, tree.left, tree.right = values, left, right
+        tree.root = root
+        return tree
+
+    @classmethod
+    def open_mmap(cls, path):
+        """
+        Отображает файл, записанный Tree.save, в память и возвращает CompactTree
+        только для чтения поверх memoryview: узлы читаются лениво при обходе,
+        объекты Node не создаются. Доступны find_paths_range и
+        check_is_avl_in_height_range, add_node и remove бросают ValueError.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ)
+        count, root = _read_tree_header(mapped)
+        view = memoryview(mapped)[TREE_HEADER.size:].cast('q')
+        tree = cls.from_buffers(
+            view[:count], view[count:2 * count], view[2 * count:3 * count], root)
+        # Отображение должно жить, пока жив объект дерева
+        tree.mapped = mapped
+        return tree
+
+    def _check_writable(self):
+        if self.mapped is not None:
+            raise ValueError("Дерево открыто через mmap только для чтения, "
+                             "для изменений загрузите его через Tree.load")
+
+    def __len__(self):
+        return len(self.values) - len(self.free)
+
+    def _alloc(self, value):
+        if self.free:
+            idx = self.free.pop()
+            self.values[idx] = value
+            self.left[idx] = NIL
+            self.right[idx] = NIL
+            return idx
+        self.values.append(value)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        return len(self.values) - 1
+
+    def add_node(self, value):
+        self._check_writable()
+        if self.root == NIL:
+            self.root = self._alloc(value)
+            return
+
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        while True:
+            if value < values[current]:
+                if left[current] == NIL:
+                    left[current] = self._alloc(value)
+                    return
+                current = left[current]
             else:
-                self._add_recursion(current.right, value)
+                if right[current] == NIL:
+                    right[current] = self._alloc(value)
+                    return
+                current = right[current]
+
+    insert = add_node
+
+    def remove(self, value):
+        self._check_writable()
+        values, left, right = self.values, self.left, self.right
+        parent = NIL
+        current = self.root
+        while current != NIL and values[current] != value:
+            parent = current
+            current = left[current] if value < values[current] else right[current]
+        if current == NIL:
+            return False
+
+        # У узла два потомка: забираем значение преемника и удаляем уже его
+        if left[current] != NIL and right[current] != NIL:
+            succ_parent = current
+            succ = right[current]
+            while left[succ] != NIL:
+                succ_parent = succ
+                succ = left[succ]
+            values[current] = values[succ]
+            parent, current = succ_parent, succ
+
+        child = left[current] if left[current] != NIL else right[current]
+        if parent == NIL:
+            self.root = child
+        elif left[parent] == current:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self.free.append(current)
+        return True
 
     def find_paths_range(self, a, b):
         self.found_paths = []
-        if self.root is not None:
-            self._dfs(self.root, [], a, b)
+        if self.root == NIL:
+            return self.found_paths
+
+        values, left, right = self.values, self.left, self.right
+        current_path = []
+        # В стеке пары (индекс узла, глубина): при переходе в узел путь
+        # обрезается до его глубины, поэтому отдельный выход из узла не нужен
+        stack = [(self.root, 0)]
+        while stack:
+            idx, depth = stack.pop()
+            del current_path[depth:]
+            current_path.append(values[idx])
+            l, r = left[idx], right[idx]
+
+            if l == NIL and r == NIL:
+                if a <= depth <= b:
+                    self.found_paths.append(list(current_path))
+                continue
+            if r != NIL:
+                stack.append((r, depth + 1))
+            if l != NIL:
+                stack.append((l, depth + 1))
         return self.found_paths
-    
-    def _dfs(self, node, current_path, a, b):
-        current_path.append(node.value)
-
-        if node.left is None and node.right is None:
-            path_length = len(current_path) - 1
-            if a <= path_length <= b:
-                self.found_paths.append(list(current_path))
-        if node.left:
-            self._dfs(node.left, current_path, a, b)
-        if node.right:
-            self._dfs(node.right, current_path, a, b)
-        
-        current_path.pop()
+
+    def check_is_avl_in_height_range(self, A, B):
+        height = self._get_height_if_avl(self.root)
+        if height == -1:
+            return False
+        return A < height < B
+
+    def _get_height_if_avl(self, idx):
+        # Без рекурсии: узлы собираются в прямом порядке, затем обход
+        # с конца считает высоты снизу вверх (потомок всегда позже родителя)
+        if idx == NIL:
+            return 0
+        order = array('q')
+        stack = [idx]
+        while stack:
+            i = stack.pop()
+            order.append(i)
+            if self.left[i] != NIL:
+                stack.append(self.left[i])
+            if self.right[i] != NIL:
+                stack.append(self.right[i])
+
+        heights = array('q', bytes(8 * len(self.values)))
+        for i in reversed(order):
+            l, r = self.left[i], self.right[i]
+            left_h = heights[l] if l != NIL else 0
+            right_h = heights[r] if r != NIL else 0
+            if abs(left_h - right_h) > 1:
+                return -1
+            heights[i] = max(left_h, right_h) + 1
+        return heights[idx]
+
+class NumpyPathIndex:
+    """
+    Векторизованные запросы по путям поверх массивов CompactTree (в том числе
+    загруженного через mmap). Родители, глубины и суммы от корня считаются
+    уровень за уровнем операциями numpy, подходящие листья выбираются масками,
+    а сами пути восстанавливаются по родителям лениво и только для найденных листьев.
+    """
+    def __init__(self, compact):
+        if np is None:
+            raise ImportError("Для NumpyPathIndex требуется numpy")
+
+        self.values = np.asarray(compact.values, dtype=np.int64)
+        left = np.asarray(compact.left, dtype=np.int64)
+        right = np.asarray(compact.right, dtype=np.int64)
+        n = len(self.values)
+
+        self.parent = np.full(n, NIL, dtype=np.int64)
+        self.depth = np.full(n, -1, dtype=np.int64)
+        self.path_sum = np.zeros(n, dtype=np.int64)
+        if compact.root != NIL:
+            # Обход по уровням: ячейки из списка свободных недостижимы и остаются с depth = -1
+            level = np.array([compact.root], dtype=np.int64)
+            self.depth[level] = 0
+            self.path_sum[level] = self.values[level]
+            while level.size:
+                parents = np.concatenate((level, level))
+                children = np.concatenate((left[level], right[level]))
+                present = children != NIL
+                parents, children = parents[present], children[present]
+                self.parent[children] = parents
+                self.depth[children] = self.depth[parents] + 1
+                self.path_sum[children] = self.path_sum[parents] + self.values[children]
+                level = children
+
+        self.is_leaf = (self.depth >= 0) & (left == NIL) & (right == NIL)
+
+    @classmethod
+    def from_tree(cls, tree):
+        return cls(tree if isinstance(tree, CompactTree) else tree.to_compact())
+
+    def leaves_in_length_range(self, a, b):
+        return np.flatnonzero(self.is_leaf & (self.depth >= a) & (self.depth <= b))
+
+    def leaves_in_sum_range(self, a, b):
+        return np.flatnonzero(self.is_leaf & (self.path_sum >= a) & (self.path_sum <= b))
+
+    def iter_paths(self, leaves):
+        parent, values = self.parent, self.values
+        for leaf in leaves:
+            nodes = []
+            idx = int(leaf)
+            while idx != NIL:
+                nodes.append(idx)
+                idx = int(parent[idx])
+            yield values[nodes[::-1]].tolist()
+
+    def find_paths_range(self, a, b):
+        return self.iter_paths(self.leaves_in_length_range(a, b))
+
+    def find_paths_in_sum_range(self, a, b):
+        return self.iter_paths(self.leaves_in_sum_range(a, b))
+
+def run_numpy_test(n=200000):
+    if np is None:
+        print("numpy не установлен, тест пропущен")
+        return
+
+    tree = Tree()
+    for _ in range(n):
+        tree.add_node(random.randint(0, 1000000))
+    index = NumpyPathIndex.from_tree(tree)
+    leaf_sums = index.path_sum[index.is_leaf]
+    a, b = (int(x) for x in np.percentile(leaf_sums, [45, 55]))
+
+    start_time = time.perf_counter()
+    expected = tree.find_paths_batch([('sum', a, b)])[0]
+    dfs_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    found = list(index.find_paths_in_sum_range(a, b))
+    numpy_time = time.perf_counter() - start_time
+
+    assert expected == found
+    print(f"N={n}, сумма в [{a}, {b}]: DFS {dfs_time:.4f} сек, "
+          f"numpy {numpy_time:.4f} сек, путей {len(found)}")
+
+def measure_tree_memory(tree_cls, values):
+    tracemalloc.start()
+    tree = tree_cls()
+    for v in values:
+        tree.add_node(v)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return used
+
+def run_memory_test():
+    for n in (10000, 100000):
+        random_vals = [random.randint(0, 1000000) for _ in range(n)]
+        node_bytes = measure_tree_memory(Tree, random_vals)
+        compact_bytes = measure_tree_memory(CompactTree, random_vals)
+        print(f"N={n}: Node {node_bytes / n:.1f} байт/узел, "
+              f"CompactTree {compact_bytes / n:.1f} байт/узел")
+
+def measure_build_time(values, balanced):
+    tree = Tree(balanced=balanced)
+    start_time = time.perf_counter()
+    for v in values:
+        tree.add_node(v)
+    return time.perf_counter() - start_time
+
+def run_serialization_test(n=200000):
+    tree = Tree()
+    for _ in range(n):
+        tree.add_node(random.randint(0, 1000000))
+
+    fd, path = tempfile.mkstemp(suffix='.tree')
+    os.close(fd)
+    try:
+        tree.save(path)
+
+        start_time = time.perf_counter()
+        loaded = Tree.load(path)
+        loaded.find_paths_range(0, 5)
+        full_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        mapped = CompactTree.open_mmap(path)
+        mapped.find_paths_range(0, 5)
+        mmap_time = time.perf_counter() - start_time
+
+        print(f"N={n}: загрузка в Node + запрос {full_time:.4f} сек, "
+              f"mmap + запрос {mmap_time:.4f} сек")
+        del mapped
+    finally:
+        os.remove(path)
+
+def run_batch_test(n=20000, windows=10):
+    tree = Tree()
+    for _ in range(n):
+        tree.add_node(random.randint(0, 1000000))
+    queries = [('length', 10 + k, 15 + k) for k in range(windows)]
+
+    start_time = time.perf_counter()
+    separate = [tree._find_paths_range(a, b) for _, a, b in queries]
+    separate_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    batched = tree.find_paths_batch(queries)
+    batch_time = time.perf_counter() - start_time
+
+    assert separate == batched
+    print(f"{windows} окон по отдельности: {separate_time:.4f} сек, "
+          f"одним обходом: {batch_time:.4f} сек")
 
 def run_performance_test():
     ns = []
     times = []
+    build_times = {
+        (order, balanced): []
+        for order in ('random', 'sorted') for balanced in (False, True)
+    }
 
     step = 500
     max_nodes = 5000
@@ -78,6 +724,11 @@ def run_performance_test():
         times.append(elapsed)
         print(f"Обработано {n} узлов за {elapsed:.6f} сек")
 
+        sorted_vals = sorted(random_vals)
+        for balanced in (False, True):
+            build_times[('random', balanced)].append(measure_build_time(random_vals, balanced))
+            build_times[('sorted', balanced)].append(measure_build_time(sorted_vals, balanced))
+
     plt.figure(figsize=(10, 6))
     plt.plot(ns, times, 'o-', linewidth=2, label='Практическое время')
 
@@ -93,6 +744,19 @@ def run_performance_test():
 
     plt.savefig('my_graph.png')
 
+    plt.figure(figsize=(10, 6))
+    for (order, balanced), build in build_times.items():
+        mode = 'AVL' if balanced else 'BST'
+        plt.plot(ns, build, 'o-', label=f'{mode}, {order}')
+
+    plt.xlabel('Количество узлов N')
+    plt.ylabel('Время построения (сек)')
+    plt.title('Построение дерева: отсортированный и случайный ввод')
+    plt.legend()
+    plt.grid(True)
+
+    plt.savefig('build_graph.png')
+
 if __name__ == "__main__":
     t = Tree()
     values = [5, 6 , 10, 12, 15, 2, 4]
@@ -105,5 +769,42 @@ if __name__ == "__main__":
     for p in paths:
         print(f"Путь: {p}, Длина: {len(p) - 1}")
 
+    t.find_paths_range(2, 3)
+    print(f"Кэш запросов: {t.cache.stats()}")
+
+    print("\n--- Пакет запросов за один обход ---")
+    queries = [('length', 2, 3), ('exact', 4), ('sum', 0, 20)]
+    for query, found in zip(queries, t.find_paths_batch(queries)):
+        print(f"{query}: {found}")
+
+    print("\n--- Потоковый поиск: первый путь длины от 1 до 4 ---")
+    first = next(t.iter_paths_range(1, 4, copy=False), None)
+    if first is not None:
+        print(f"Путь: {first.tolist()}, Длина: {len(first) - 1}")
+
+    bulk = Tree.from_iterable(values)
+    print("\n--- Tree.from_iterable: Пути длины от 2 до 3 ---")
+    for p in bulk.find_paths_range(2, 3):
+        print(f"Путь: {p}, Длина: {len(p) - 1}")
+
+    ct = CompactTree()
+    for n in values:
+        ct.add_node(n)
+    print("\n--- CompactTree: Пути длины от 2 до 3 ---")
+    for p in ct.find_paths_range(2, 3):
+        print(f"Путь: {p}, Длина: {len(p) - 1}")
+
+    print("\n--- Сохранение и загрузка через mmap ---")
+    run_serialization_test()
+
+    print("\n--- Векторизованные запросы (numpy) ---")
+    run_numpy_test()
+
+    print("\n--- Пакетные запросы против отдельных ---")
+    run_batch_test()
+
+    print("\n--- Память на узел ---")
+    run_memory_test()
+
     print("\n--- Построение графика ---")
     run_performance_test()
@@ -1,4 +1,8 @@
 import sys
+import time
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 sys.setrecursionlimit(20000)
 
@@ -7,13 +11,22 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        # Сводка по поддереву, обновляется вдоль пути вставки
+        self.height = 1
+        self.is_avl = True
+        self.is_chain = True
+        self.min_value = value
+        self.max_value = value
 
 class Tree:
-    def __init__(self):
+    def __init__(self, balanced=False):
         self.root = None
+        self.balanced = balanced
 
     def add_node(self, value):
-        if self.root is None:
+        if self.balanced:
+            self.root = self._add_avl(self.root, value)
+        elif self.root is None:
             self.root = Node(value)
         else:
             self._add(self.root, value)
@@ -29,9 +42,77 @@ class Tree:
                 node.right = Node(value)
             else:
                 self._add(node.right, value)
+        self._update(node)
+
+    def _add_avl(self, node, value):
+        if node is None:
+            return Node(value)
+        if value < node.value:
+            node.left = self._add_avl(node.left, value)
+        else:
+            node.right = self._add_avl(node.right, value)
+        return self._rebalance(node)
+
+    @staticmethod
+    def _height(node):
+        return node.height if node is not None else 0
+
+    @staticmethod
+    def _update(node):
+        left, right = node.left, node.right
+        left_h = left.height if left is not None else 0
+        right_h = right.height if right is not None else 0
+        node.height = max(left_h, right_h) + 1
+        node.is_avl = (abs(left_h - right_h) <= 1
+                       and (left is None or left.is_avl)
+                       and (right is None or right.is_avl))
+
+        node.min_value = node.max_value = node.value
+        if left is not None and right is not None:
+            node.is_chain = False
+        else:
+            child = left if left is not None else right
+            node.is_chain = child is None or child.is_chain
+        for child in (left, right):
+            if child is not None:
+                node.min_value = min(node.min_value, child.min_value)
+                node.max_value = max(node.max_value, child.max_value)
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
 
     def check_is_linear_in_range(self, c, d):
-        return self._check_linear_recursive(self.root, c, d)
+        # O(1): ответ берется из сводки корня
+        root = self.root
+        if root is None:
+            return True
+        return root.is_chain and c <= root.min_value and root.max_value <= d
 
     def _check_linear_recursive(self, node, c, d):
         if node is None:
@@ -47,6 +128,21 @@ class Tree:
                self._check_linear_recursive(node.right, c, d)
 
     def check_is_avl_in_height_range(self, A, B):
+        root = self.root
+        if root is None:
+            height = 0
+        elif root.is_avl:
+            height = root.height
+        else:
+            return False
+        return A < height < B
+
+    # Полный пересчет обходом всего дерева, без сохраненных сводок
+
+    def check_is_linear_in_range_full(self, c, d):
+        return self._check_linear_recursive(self.root, c, d)
+
+    def check_is_avl_in_height_range_full(self, A, B):
         height = self._get_height_if_avl(self.root)
         if height == -1:
             return False
@@ -69,6 +165,102 @@ class Tree:
             
         return max(left_h, right_h) + 1
 
+def serialize_tree(root):
+    # Прямой порядок обхода: значения и относительные смещения до детей (0 - нет потомка).
+    # Любое поддерево - непрерывный срез, который можно отдать другому процессу.
+    values, left, right = array('q'), array('q'), array('q')
+    stack = [(root, -1, False)] if root is not None else []
+    while stack:
+        node, parent, is_right = stack.pop()
+        idx = len(values)
+        values.append(node.value)
+        left.append(0)
+        right.append(0)
+        if parent >= 0:
+            if is_right:
+                right[parent] = idx - parent
+            else:
+                left[parent] = idx - parent
+        if node.right is not None:
+            stack.append((node.right, idx, True))
+        if node.left is not None:
+            stack.append((node.left, idx, False))
+    return values, left, right
+
+def _avl_height(left_h, right_h):
+    if left_h == -1 or right_h == -1 or abs(left_h - right_h) > 1:
+        return -1
+    return max(left_h, right_h) + 1
+
+def _avl_height_of_slice(task):
+    # Дети в прямом порядке стоят правее родителя, поэтому
+    # проход с конца считает высоты снизу вверх без рекурсии
+    left, right = task
+    heights = array('q', bytes(8 * len(left)))
+    for i in range(len(left) - 1, -1, -1):
+        left_h = heights[i + left[i]] if left[i] else 0
+        right_h = heights[i + right[i]] if right[i] else 0
+        heights[i] = _avl_height(left_h, right_h)
+    return heights[0]
+
+def get_height_if_avl_parallel(serialized, workers=4, split_depth=3):
+    """
+    Параллельный аналог _get_height_if_avl: поддеревья на глубине split_depth
+    считаются в пуле процессов, верхние узлы досчитываются в основном процессе.
+    """
+    _, left, right = serialized
+    if not left:
+        return 0
+
+    # Верхние узлы в прямом порядке; граничное поддерево тянется
+    # до следующего посещенного узла
+    order = []
+    frontier = []
+    stack = [(0, 0)]
+    while stack:
+        i, depth = stack.pop()
+        order.append(i)
+        if depth == split_depth:
+            frontier.append(len(order) - 1)
+            continue
+        if right[i]:
+            stack.append((i + right[i], depth + 1))
+        if left[i]:
+            stack.append((i + left[i], depth + 1))
+    order.append(len(left))
+
+    tasks = [(left[order[k]:order[k + 1]], right[order[k]:order[k + 1]]) for k in frontier]
+    heights = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for k, height in zip(frontier, pool.map(_avl_height_of_slice, tasks)):
+                heights[order[k]] = height
+
+    for i in reversed(order[:-1]):
+        if i in heights:
+            continue
+        left_h = heights[i + left[i]] if left[i] else 0
+        right_h = heights[i + right[i]] if right[i] else 0
+        heights[i] = _avl_height(left_h, right_h)
+    return heights[0]
+
+def benchmark_parallel(size=100000, split_depth=4, worker_counts=(1, 2, 4, 8)):
+    t = Tree(balanced=True)
+    for _ in range(size):
+        t.add_node(random.randint(0, 10 ** 9))
+    serialized = serialize_tree(t.root)
+
+    start = time.perf_counter()
+    t._get_height_if_avl(t.root)
+    sequential = time.perf_counter() - start
+    print(f"N={size}, sequential: {sequential:.3f} s")
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        get_height_if_avl_parallel(serialized, workers=workers, split_depth=split_depth)
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers}: {elapsed:.3f} s, speedup x{sequential / elapsed:.2f}")
+
 if __name__ == "__main__":
     t = Tree()
     values = [10, 5, 12, 3] 
@@ -76,4 +268,12 @@ if __name__ == "__main__":
         t.add_node(v)
 
     print(t.check_is_linear_in_range(0, 20))
-    print(t.check_is_avl_in_height_range(2, 5))
\ No newline at end of file
+    print(t.check_is_avl_in_height_range(2, 5))
+
+    balanced = Tree(balanced=True)
+    for v in range(1, 32):
+        balanced.add_node(v)
+    print(balanced.check_is_avl_in_height_range(4, 6))
+    print(get_height_if_avl_parallel(serialize_tree(balanced.root), workers=2, split_depth=2))
+
+    benchmark_parallel()
\ No newline at end of file
@@ -1,9 +1,11 @@
 #Реализуйте класс бинарного дерева Tree с использованием класса узла Node и функцию для проверки, является ли N-нарное дерево бинарным деревом поиска, зеркальным (123->321) по значениям в узлах относительно своего центра (корня). Проверьте работу функции на различных конфигурациях деревьев. Обоснуйте и подтвердите сложность алгоритма (график теор. и практич. времени)
 
+import os
 import sys
 import time
 import random
 from array import array
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 
 # Увеличиваем лимит рекурсии для глубоких деревьев
@@ -38,6 +40,157 @@ def is_mirrored_bst(node, min_val=float('-inf'), max_val=float('inf')):
     return (is_mirrored_bst(node.left, node.value, max_val) and
             is_mirrored_bst(node.right, min_val, node.value))
 
+def find_mirrored_bst_violation(root):
+    """
+    Итеративная проверка зеркального BST (без рекурсии), останавливается на первом нарушении.
+    Возвращает None, если дерево корректно, иначе кортеж (path, value, (min_val, max_val)):
+    значения от корня до нарушившего узла, его значение и границы, в которые оно не попало.
+    """
+    if root is None:
+        return None
+
+    path = []
+    stack = [(root, 0, float('-inf'), float('inf'))]
+    while stack:
+        node, depth, min_val, max_val = stack.pop()
+        del path[depth:]
+        path.append(node.value)
+
+        if not (min_val < node.value < max_val):
+            return path, node.value, (min_val, max_val)
+
+        # Те же границы, что и в is_mirrored_bst: слева больше узла, справа меньше
+        if node.right is not None:
+            stack.append((node.right, depth + 1, min_val, node.value))
+        if node.left is not None:
+            stack.append((node.left, depth + 1, node.value, max_val))
+    return None
+
+def is_mirrored_bst_inorder(root):
+    """
+    Потоковая проверка: симметричный обход (левое -> узел -> правое) зеркального BST
+    выдает значения строго по убыванию. Память O(высоты) - только стек текущей ветви.
+    """
+    stack = []
+    node = root
+    has_prev = False
+    prev = None
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        if has_prev and not node.value < prev:
+            return False
+        prev = node.value
+        has_prev = True
+        node = node.right
+    return True
+
+# --- Параллельная проверка ---
+
+def serialize_tree(root):
+    """
+    Раскладывает дерево в три массива array('q') в прямом порядке обхода:
+    значения и смещения от узла до левого/правого потомка (0 - потомка нет).
+    Смещения относительные, поэтому любое поддерево - непрерывный срез [i, end),
+    который можно без изменений передать в другой процесс.
+    """
+    values, left, right = array('q'), array('q'), array('q')
+    stack = [(root, -1, False)] if root is not None else []
+    while stack:
+        node, parent, is_right = stack.pop()
+        idx = len(values)
+        values.append(node.value)
+        left.append(0)
+        right.append(0)
+        if parent >= 0:
+            if is_right:
+                right[parent] = idx - parent
+            else:
+                left[parent] = idx - parent
+        if node.right is not None:
+            stack.append((node.right, idx, True))
+        if node.left is not None:
+            stack.append((node.left, idx, False))
+    return values, left, right
+
+def _check_mirrored_slice(task):
+    """Проверка одного поддерева в процессе-исполнителе"""
+    values, left, right, min_val, max_val = task
+    # В прямом порядке за узлом идет его левый потомок, а если его нет -
+    # правый потомок ближайшего предка, у которого он еще не проверен.
+    # Поэтому срез читается подряд, а в стек откладываются только границы
+    # правых потомков: стек растет до высоты дерева, а не до размера среза
+    low, high = min_val, max_val
+    stack = []
+    for v, l, r in zip(values, left, right):
+        if not (low < v < high):
+            return False
+        if r:
+            stack.append((low, v))
+        if l:
+            low = v
+        elif stack:
+            low, high = stack.pop()
+    return True
+
+def _timed_check_mirrored_slice(task):
+    """То же, что _check_mirrored_slice, плюс pid исполнителя и время самого цикла проверки"""
+    start_time = time.perf_counter()
+    result = _check_mirrored_slice(task)
+    return result, os.getpid(), time.perf_counter() - start_time
+
+def _split_mirrored_tasks(serialized, split_depth):
+    """
+    Проверяет узлы выше split_depth и режет остальное на задачи для пула.
+    Возвращает None, если нарушение нашлось уже в верхних узлах,
+    иначе список задач (срезы массивов и унаследованные границы).
+    """
+    values, left, right = serialized
+
+    # Верхние узлы посещаются в прямом порядке: поддерево граничного узла
+    # заканчивается там, где начинается следующий посещенный узел
+    starts = []
+    frontier = []
+    stack = [(0, 0, float('-inf'), float('inf'))]
+    while stack:
+        i, depth, min_val, max_val = stack.pop()
+        starts.append(i)
+        if depth == split_depth:
+            frontier.append((len(starts) - 1, min_val, max_val))
+            continue
+        v = values[i]
+        if not (min_val < v < max_val):
+            return None
+        if right[i]:
+            stack.append((i + right[i], depth + 1, min_val, v))
+        if left[i]:
+            stack.append((i + left[i], depth + 1, v, max_val))
+
+    starts.append(len(values))
+    tasks = []
+    for k, min_val, max_val in frontier:
+        start, end = starts[k], starts[k + 1]
+        tasks.append((values[start:end], left[start:end], right[start:end], min_val, max_val))
+    return tasks
+
+def is_mirrored_bst_parallel(serialized, workers=4, split_depth=3):
+    """
+    Узлы выше split_depth проверяются в основном процессе, а поддеревья
+    на глубине split_depth вместе с унаследованными границами уходят в пул процессов.
+    """
+    if not serialized[0]:
+        return True
+    tasks = _split_mirrored_tasks(serialized, split_depth)
+    if tasks is None:
+        return False
+    if not tasks:
+        return True
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return all(pool.map(_check_mirrored_slice, tasks))
+
 # --- Вспомогательные функции для генерации деревьев ---
 
 def build_perfect_reverse_bst(start, end):
@@ -87,20 +240,69 @@ def generate_random_tree(size):
 
 def benchmark():
     sizes = array('i', range(100, 10100, 500))
-    times = array('d')
+    checks = {
+        'Recursive': is_mirrored_bst,
+        'Iterative': find_mirrored_bst_violation,
+        'In-order stream': is_mirrored_bst_inorder,
+    }
+    times = {name: array('d') for name in checks}
     
     for n in sizes:
         # Генерируем ВАЛИДНОЕ дерево, чтобы алгоритм прошел все N узлов
         tree = generate_valid_tree(n)
         
-        start_time = time.perf_counter()
-        is_mirrored_bst(tree.root)
-        end_time = time.perf_counter()
-        
-        times.append(end_time - start_time)
+        for name, check in checks.items():
+            start_time = time.perf_counter()
+            check(tree.root)
+            end_time = time.perf_counter()
+            times[name].append(end_time - start_time)
         
     return sizes, times
 
+def benchmark_parallel(size=1000000, split_depth=4, worker_counts=(1, 2, 4, 8)):
+    """
+    Кроме общего времени печатает его составляющие: нарезку задач, запуск пула,
+    сам цикл проверки в исполнителях (самый загруженный процесс) и остаток -
+    сериализацию срезов, передачу между процессами и ожидание.
+    """
+    tree = generate_valid_tree(size)
+    serialized = serialize_tree(tree.root)
+
+    start_time = time.perf_counter()
+    is_mirrored_bst(tree.root)
+    sequential = time.perf_counter() - start_time
+    print(f"N={size}, последовательно (рекурсия): {sequential:.3f} сек")
+
+    start_time = time.perf_counter()
+    tasks = _split_mirrored_tasks(serialized, split_depth)
+    split_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for task in tasks:
+        _check_mirrored_slice(task)
+    in_process = time.perf_counter() - start_time
+    print(f"Нарезка задач: {split_time:.3f} сек, цикл проверки без пула: {in_process:.3f} сек")
+
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Пустые задачи заставляют пул поднять процессы до замера проверки
+            list(pool.map(_check_mirrored_slice, [((), (), (), 0, 0)] * workers))
+            ready_time = time.perf_counter()
+            results = list(pool.map(_timed_check_mirrored_slice, tasks))
+            done_time = time.perf_counter()
+        elapsed = time.perf_counter() - start_time
+
+        loop_by_worker = {}
+        for _, pid, loop_time in results:
+            loop_by_worker[pid] = loop_by_worker.get(pid, 0.0) + loop_time
+        loop = max(loop_by_worker.values())
+        startup = ready_time - start_time
+        transfer = (done_time - ready_time) - loop
+        print(f"Процессов: {workers}, всего: {elapsed:.3f} сек, ускорение x{sequential / elapsed:.2f} | "
+              f"запуск пула: {startup:.3f}, цикл в исполнителе: {loop:.3f} "
+              f"(x{sequential / loop:.2f}), передача и ожидание: {transfer:.3f}")
+
 # --- Демонстрация ---
 
 def print_example():
@@ -138,16 +340,27 @@ def print_example():
     t3.root.left.left = Node(12) 
     print(f"Test 3 (Invalid Deep):     {is_mirrored_bst(t3.root)}") # Ожидаем False
 
+    # Итеративная проверка сообщает, где именно нарушено условие
+    path, value, (low, high) = find_mirrored_bst_violation(t3.root)
+    print(f"Violation: path {path}, value {value} not in ({low}, {high})")
+    print(f"In-order stream: {is_mirrored_bst_inorder(t1.root)}, {is_mirrored_bst_inorder(t3.root)}")
+
+    valid = generate_valid_tree(1000)
+    print(f"Parallel (valid, 1000 nodes): "
+          f"{is_mirrored_bst_parallel(serialize_tree(valid.root), workers=2, split_depth=2)}")
+
 if __name__ == "__main__":
     print_example()
     
     print("\n--- Запуск тестов производительности (O(N)) ---")
-    sizes, measured_times = benchmark()
+    sizes, all_times = benchmark()
+    measured_times = all_times['Recursive']
     
     plt.figure(figsize=(10, 6))
     
     # Практическое время
-    plt.plot(sizes, measured_times, label='Practical Time', marker='o')
+    for name, variant_times in all_times.items():
+        plt.plot(sizes, variant_times, label=f'Practical Time ({name})', marker='o')
     
     # Теоретическое время O(N)
     # Рассчитываем коэффициент k по последней точке
@@ -167,3 +380,6 @@ if __name__ == "__main__":
     
     plt.savefig('mirrored_bst_benchmark.png')
     print("Graph saved to mirrored_bst_benchmark.png")
+
+    print("\n--- Параллельная проверка: масштабирование по числу процессов ---")
+    benchmark_parallel()
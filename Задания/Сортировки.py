@@ -1,23 +1,51 @@
 #Реализуйте два алгоритма сортировки: слиянием и вставками. Сравните их производительность, а также производительность встроенной сортировки, на случайных, почти отсортированных и обратно отсортированных массивах
 
+import os
 import sys
 import time
+import heapq
 import random
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Увеличиваем лимит рекурсии для Merge Sort
 sys.setrecursionlimit(20000)
 
 # --- 1. Алгоритм сортировки вставками (Insertion Sort) ---
-def insertion_sort(arr):
-    for i in range(1, len(arr)):
+# lo/hi позволяют отсортировать только отрезок arr[lo:hi] (нужно гибридной сортировке слиянием)
+def insertion_sort(arr, lo=0, hi=None):
+    if hi is None:
+        hi = len(arr)
+    for i in range(lo + 1, hi):
         key = arr[i]
         j = i - 1
-        while j >= 0 and key < arr[j]:
+        while j >= lo and key < arr[j]:
             arr[j + 1] = arr[j]
             j -= 1
         arr[j + 1] = key
 
+# --- 1б. Вставки с двоичным поиском места ---
+# Место вставки ищется bisect за O(log N) сравнений, а сдвиг блока
+# делается одним присваиванием среза вместо поэлементного цикла
+def binary_insertion_sort(arr, lo=0, hi=None):
+    if hi is None:
+        hi = len(arr)
+    for i in range(lo + 1, hi):
+        key = arr[i]
+        # bisect_right ставит равные элементы после уже стоящих - сортировка устойчива
+        pos = bisect_right(arr, key, lo, i)
+        if pos != i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = key
+
 # --- 2. Алгоритм сортировки слиянием (Merge Sort) ---
 def merge_sort(arr):
     if len(arr) > 1:
@@ -48,6 +76,283 @@ def merge_sort(arr):
             j += 1
             k += 1
 
+# --- 2б. Гибридная сортировка слиянием ---
+# Отрезки короче порога досортировываются вставками
+INSERTION_THRESHOLD = 32
+
+def merge_sort_hybrid(arr, threshold=INSERTION_THRESHOLD):
+    # Один вспомогательный буфер на всю сортировку: на каждом уровне рекурсии
+    # исходный массив и буфер меняются ролями, поэтому срезы L/R не создаются
+    aux = list(arr)
+    _merge_sort_pingpong(aux, arr, 0, len(arr), threshold)
+
+def _merge_sort_pingpong(src, dst, lo, hi, threshold):
+    # Сортирует отрезок [lo, hi) в dst; в src на входе те же элементы, он служит буфером
+    if hi - lo <= threshold:
+        insertion_sort(dst, lo, hi)
+        return
+
+    mid = (lo + hi) // 2
+    # Половины сортируются в src, а dst для них становится буфером
+    _merge_sort_pingpong(dst, src, lo, mid, threshold)
+    _merge_sort_pingpong(dst, src, mid, hi, threshold)
+
+    # Половины уже идут по порядку - слияние не нужно, только копирование
+    if not src[mid] < src[mid - 1]:
+        dst[lo:hi] = src[lo:hi]
+        return
+
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+
+# --- 2в. Адаптивная (естественная) сортировка слиянием ---
+# Короткие серии добиваются вставками до MIN_RUN элементов; после MIN_GALLOP
+# побед одной стороны подряд слияние переходит в режим галопа
+MIN_RUN = 32
+MIN_GALLOP = 7
+
+def natural_merge_sort(arr, min_run=MIN_RUN):
+    n = len(arr)
+    # Разбиваем массив на уже упорядоченные серии
+    runs = []
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and arr[hi] < arr[hi - 1]:
+            # Строго убывающую серию разворачиваем (строгость сохраняет устойчивость)
+            while hi < n and arr[hi] < arr[hi - 1]:
+                hi += 1
+            arr[lo:hi] = arr[lo:hi][::-1]
+        else:
+            while hi < n and not arr[hi] < arr[hi - 1]:
+                hi += 1
+
+        if hi - lo < min_run and hi < n:
+            hi = min(lo + min_run, n)
+            insertion_sort(arr, lo, hi)
+        runs.append(lo)
+        lo = hi
+    runs.append(n)
+
+    # Попарно сливаем соседние серии, пока не останется одна
+    while len(runs) > 2:
+        merged = []
+        for k in range(0, len(runs) - 1, 2):
+            if k + 2 < len(runs):
+                _gallop_merge(arr, runs[k], runs[k + 1], runs[k + 2])
+            merged.append(runs[k])
+        merged.append(n)
+        runs = merged
+
+def _gallop(arr, x, lo, hi, strict):
+    # Экспоненциальный поиск от lo: первый индекс с arr[i] > x (strict) или arr[i] >= x.
+    # Дешевле двоичного поиска по всему отрезку, когда ответ близко к началу
+    bisect = bisect_right if strict else bisect_left
+    step = 1
+    prev = lo
+    while lo + step < hi and (not x < arr[lo + step] if strict else arr[lo + step] < x):
+        prev = lo + step
+        step *= 2
+    return bisect(arr, x, prev, min(lo + step, hi))
+
+def _gallop_merge(arr, lo, mid, hi):
+    # Серии уже стоят по порядку
+    if not arr[mid] < arr[mid - 1]:
+        return
+
+    # Начало левой серии, не превосходящее arr[mid], и хвост правой,
+    # не меньший arr[mid - 1], уже на своих местах
+    lo = bisect_right(arr, arr[mid], lo, mid)
+    hi = bisect_left(arr, arr[mid - 1], mid, hi)
+
+    left = arr[lo:mid]
+    left_len = len(left)
+    i, j, k = 0, mid, lo
+    left_wins = right_wins = 0
+    while i < left_len and j < hi:
+        if arr[j] < left[i]:
+            arr[k] = arr[j]
+            j += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP:
+                end = _gallop(arr, left[i], j, hi, strict=False)
+                arr[k:k + end - j] = arr[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            arr[k] = left[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP and j < hi:
+                end = _gallop(left, arr[j], i, left_len, strict=True)
+                arr[k:k + end - i] = left[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+
+    # Остаток правой серии уже на месте, остаток левой копируем
+    if i < left_len:
+        arr[k:k + left_len - i] = left[i:]
+
+# --- 2г. Внешняя сортировка (данные больше оперативной памяти) ---
+# Файлы хранят числа подряд в двоичном виде array('q')
+EXTERNAL_TYPECODE = 'q'
+# Оценка памяти на элемент при сортировке куска: ячейка массива + ссылка в списке + объект int
+BYTES_PER_SORTED_ITEM = 48
+
+def _sort_chunk(task):
+    # Выполняется в процессе пула: читает свой кусок входного файла и пишет отсортированную серию
+    input_path, offset, count, run_path = task
+    chunk = array(EXTERNAL_TYPECODE)
+    with open(input_path, 'rb') as f:
+        f.seek(offset * chunk.itemsize)
+        chunk.fromfile(f, count)
+    chunk = array(EXTERNAL_TYPECODE, sorted(chunk))
+    with open(run_path, 'wb') as f:
+        chunk.tofile(f)
+    return run_path
+
+def _read_run(path, block_items):
+    # Серия читается блоками, в памяти одновременно не больше block_items чисел
+    with open(path, 'rb') as f:
+        while True:
+            block = array(EXTERNAL_TYPECODE)
+            try:
+                block.fromfile(f, block_items)
+            except EOFError:
+                # fromfile успевает прочитать неполный последний блок
+                yield from block
+                return
+            yield from block
+
+def external_sort(input_path, output_path, memory_budget=256 * 2**20, workers=4):
+    """
+    Сортирует файл чисел, не загружая его целиком: куски размером по бюджету памяти
+    сортируются в пуле процессов и сбрасываются во временные файлы-серии, затем
+    серии сливаются через кучу (heapq.merge) в выходной файл. Возвращает число серий.
+    """
+    itemsize = array(EXTERNAL_TYPECODE).itemsize
+    total = os.path.getsize(input_path) // itemsize
+    # Бюджет делится между процессами: каждый держит в памяти один кусок
+    chunk_items = max(1, memory_budget // (workers * BYTES_PER_SORTED_ITEM))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tasks = [
+            (input_path, offset, min(chunk_items, total - offset), os.path.join(tmp_dir, f'run{k}.bin'))
+            for k, offset in enumerate(range(0, total, chunk_items))
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            run_paths = list(pool.map(_sort_chunk, tasks))
+
+        # На этапе слияния бюджет делится между буферами серий и выходным буфером
+        block_items = max(1, memory_budget // ((len(run_paths) + 1) * itemsize))
+        runs = [_read_run(path, block_items) for path in run_paths]
+        with open(output_path, 'wb') as out:
+            buffer = array(EXTERNAL_TYPECODE)
+            for value in heapq.merge(*runs):
+                buffer.append(value)
+                if len(buffer) >= block_items:
+                    buffer.tofile(out)
+                    buffer = array(EXTERNAL_TYPECODE)
+            buffer.tofile(out)
+
+    return len(run_paths)
+
+# --- 2д. Сортировки для целых чисел (подсчетом и поразрядная) ---
+# Подсчет выгоден, пока диапазон значений не больше COUNTING_RANGE_FACTOR * N,
+# иначе используется поразрядная LSD-сортировка
+COUNTING_RANGE_FACTOR = 4
+RADIX_BITS = 8
+
+def _repeat(arr, value, count):
+    # Блок одинаковых значений того же типа, что и сортируемый контейнер
+    if isinstance(arr, array):
+        return array(arr.typecode, [value]) * count
+    return [value] * count
+
+def counting_sort(arr, lo, hi):
+    counts = [0] * (hi - lo + 1)
+    for v in arr:
+        counts[v - lo] += 1
+    k = 0
+    for offset, count in enumerate(counts):
+        if count:
+            arr[k:k + count] = _repeat(arr, lo + offset, count)
+            k += count
+
+def radix_sort(arr, lo, hi):
+    # Ключи сдвигаются на lo, чтобы отрицательные числа сортировались так же
+    keys = [v - lo for v in arr]
+    mask = (1 << RADIX_BITS) - 1
+    shift = 0
+    while (hi - lo) >> shift:
+        buckets = [[] for _ in range(mask + 1)]
+        for key in keys:
+            buckets[(key >> shift) & mask].append(key)
+        keys = [key for bucket in buckets for key in bucket]
+        shift += RADIX_BITS
+    sorted_values = [key + lo for key in keys]
+    arr[:] = array(arr.typecode, sorted_values) if isinstance(arr, array) else sorted_values
+
+def _integer_sort_numpy(arr):
+    # array('i') читается и перезаписывается через общий буфер, без копии в список
+    if isinstance(arr, array):
+        view = np.frombuffer(arr, dtype=np.dtype(arr.typecode))
+        data = view.astype(np.int64)
+    else:
+        view = None
+        data = np.asarray(arr, dtype=np.int64)
+    lo, hi = int(data.min()), int(data.max())
+    if hi - lo + 1 <= COUNTING_RANGE_FACTOR * len(arr):
+        counts = np.bincount(data - lo)
+        result = np.repeat(np.arange(lo, hi + 1, dtype=np.int64), counts)
+    else:
+        # Устойчивая сортировка numpy для 16-битных ключей сама является поразрядной
+        result = data - lo
+        for shift in range(0, (hi - lo).bit_length(), 16):
+            digits = ((result >> shift) & 0xFFFF).astype(np.uint16)
+            result = result[np.argsort(digits, kind='stable')]
+        result += lo
+    if view is not None:
+        view[:] = result
+    else:
+        arr[:] = result.tolist()
+
+def integer_sort(arr, use_numpy=True):
+    """
+    Сортировка целых чисел (список или array('i')) с выбором алгоритма
+    по диапазону значений: подсчетом для узких диапазонов, поразрядная иначе.
+    При наличии numpy используются его векторные операции.
+    """
+    if len(arr) < 2:
+        return
+    if use_numpy and np is not None:
+        _integer_sort_numpy(arr)
+        return
+
+    lo, hi = min(arr), max(arr)
+    if hi - lo + 1 <= COUNTING_RANGE_FACTOR * len(arr):
+        counting_sort(arr, lo, hi)
+    else:
+        radix_sort(arr, lo, hi)
+
 # --- 3. Генерация данных ---
 def generate_array(size, kind):
     if kind == 'random':
@@ -73,7 +378,7 @@ def run_benchmark():
     
     # Структура для хранения результатов: results['random']['insertion'] = [time1, time2...]
     results = {
-        kind: {'insertion': [], 'merge': [], 'builtin': []} 
+        kind: {'insertion': [], 'binary_insertion': [], 'merge': [], 'merge_hybrid': [], 'natural': [], 'integer': [], 'builtin': []} 
         for kind in scenarios
     }
     
@@ -87,12 +392,36 @@ def run_benchmark():
             insertion_sort(arr)
             results[kind]['insertion'].append(time.perf_counter() - t0)
             
+            # Тест вставок с двоичным поиском
+            arr = list(base_data)
+            t0 = time.perf_counter()
+            binary_insertion_sort(arr)
+            results[kind]['binary_insertion'].append(time.perf_counter() - t0)
+            
             # Тест Merge Sort
             arr = list(base_data)
             t0 = time.perf_counter()
             merge_sort(arr)
             results[kind]['merge'].append(time.perf_counter() - t0)
             
+            # Тест гибридной сортировки слиянием
+            arr = list(base_data)
+            t0 = time.perf_counter()
+            merge_sort_hybrid(arr)
+            results[kind]['merge_hybrid'].append(time.perf_counter() - t0)
+            
+            # Тест адаптивной сортировки слиянием
+            arr = list(base_data)
+            t0 = time.perf_counter()
+            natural_merge_sort(arr)
+            results[kind]['natural'].append(time.perf_counter() - t0)
+            
+            # Тест сортировки целых чисел на типизированном массиве
+            arr = array('i', base_data)
+            t0 = time.perf_counter()
+            integer_sort(arr)
+            results[kind]['integer'].append(time.perf_counter() - t0)
+            
             # Тест Built-in (Timsort)
             arr = list(base_data)
             t0 = time.perf_counter()
@@ -101,6 +430,74 @@ def run_benchmark():
             
     return sizes, results
 
+# --- 4б. Бенчмарк внешней сортировки ---
+def generate_file(path, total_items, kind, chunk_items=1_000_000):
+    # Файл пишется кусками из generate_array, чтобы не держать весь массив в памяти
+    with open(path, 'wb') as f:
+        written = 0
+        while written < total_items:
+            count = min(chunk_items, total_items - written)
+            array(EXTERNAL_TYPECODE, generate_array(count, kind)).tofile(f)
+            written += count
+
+def is_file_sorted(path, block_items=1_000_000):
+    prev = None
+    for value in _read_run(path, block_items):
+        if prev is not None and value < prev:
+            return False
+        prev = value
+    return True
+
+def run_external_benchmark(size_gb=2.0, kind='random', memory_budget=256 * 2**20, workers=4):
+    total_items = int(size_gb * 2**30) // array(EXTERNAL_TYPECODE).itemsize
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, 'input.bin')
+        output_path = os.path.join(tmp_dir, 'output.bin')
+
+        t0 = time.perf_counter()
+        generate_file(input_path, total_items, kind)
+        gen_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        runs = external_sort(input_path, output_path, memory_budget, workers)
+        sort_time = time.perf_counter() - t0
+
+        assert is_file_sorted(output_path)
+        size_mb = total_items * array(EXTERNAL_TYPECODE).itemsize / 2**20
+        print(f"{size_mb:.0f} MB ({kind}), workers={workers}, budget={memory_budget // 2**20} MB: "
+              f"generate {gen_time:.1f} s, sort {sort_time:.1f} s ({runs} runs, {size_mb / sort_time:.1f} MB/s)")
+
+# Обертка над значением, считающая сравнения (все сортировки сравнивают через <)
+class CountedValue:
+    __slots__ = ('value',)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        CountedValue.comparisons += 1
+        return self.value < other.value
+
+def count_comparisons(sort_func, data):
+    arr = [CountedValue(v) for v in data]
+    CountedValue.comparisons = 0
+    sort_func(arr)
+    return CountedValue.comparisons
+
+def run_comparison_report(size=1500):
+    print(f"{'Scenario':<10} {'Algorithm':<18} {'Comparisons':>12} {'Time (sec)':>12}")
+    for kind in ['random', 'sorted', 'reverse']:
+        base_data = generate_array(size, kind)
+        for name, sort_func in [('insertion', insertion_sort),
+                                ('binary insertion', binary_insertion_sort)]:
+            comparisons = count_comparisons(sort_func, base_data)
+            arr = list(base_data)
+            t0 = time.perf_counter()
+            sort_func(arr)
+            elapsed = time.perf_counter() - t0
+            print(f"{kind:<10} {name:<18} {comparisons:>12} {elapsed:>12.6f}")
+
 # --- 5. Построение графиков ---
 if __name__ == "__main__":
     print("Running benchmark (may take a few seconds)...")
@@ -120,12 +517,20 @@ if __name__ == "__main__":
         
         # Получаем данные
         y_ins = results[kind]['insertion']
+        y_bin = results[kind]['binary_insertion']
         y_mrg = results[kind]['merge']
+        y_hyb = results[kind]['merge_hybrid']
+        y_nat = results[kind]['natural']
+        y_int = results[kind]['integer']
         y_blt = results[kind]['builtin']
         
         # Рисуем линии
         ax.plot(sizes, y_ins, label='Insertion', marker='o')
+        ax.plot(sizes, y_bin, label='Binary insertion', marker='x')
         ax.plot(sizes, y_mrg, label='Merge', marker='s')
+        ax.plot(sizes, y_hyb, label='Merge (hybrid)', marker='D')
+        ax.plot(sizes, y_nat, label='Natural merge', marker='v')
+        ax.plot(sizes, y_int, label='Integer (counting/radix)', marker='*')
         ax.plot(sizes, y_blt, label='Built-in', marker='^', linestyle='--')
         
         ax.set_title(scenario_titles[kind])
@@ -137,3 +542,10 @@ if __name__ == "__main__":
     plt.tight_layout()
     plt.savefig('sorting_comparison.png')
     print("Graphs saved to 'sorting_comparison.png'")
+
+    print("\nInsertion sort: comparisons and time")
+    run_comparison_report()
+
+    # Небольшой прогон для проверки; для многогигабайтных входов увеличьте size_gb
+    print("\nExternal merge sort")
+    run_external_benchmark(size_gb=0.02, memory_budget=8 * 2**20, workers=os.cpu_count() or 1)
@@ -7,95 +7,445 @@ import string
 from array import array
 import matplotlib.pyplot as plt
 
+MASK64 = (1 << 64) - 1
+MASK63 = (1 << 63) - 1  # Хеши хранятся в array('q'), поэтому не больше 63 бит
+
+# --- Хеш-функции ---
+
+def _key_bytes(key):
+    if isinstance(key, bytes):
+        return key
+    if isinstance(key, int):
+        return key.to_bytes(key.bit_length() // 8 + 1, 'little', signed=True)
+    return str(key).encode()
+
+def fnv1a_hash(key):
+    h = 0xcbf29ce484222325
+    for b in _key_bytes(key):
+        h = ((h ^ b) * 0x100000001b3) & MASK64
+    return h & MASK63
+
+def fibonacci_hash(key):
+    # Умножение на 2**64 / phi. Хорошо перемешаны старшие биты произведения,
+    # а индекс берется по младшим битам результата, поэтому младшие 31 отбрасываются
+    if isinstance(key, int):
+        h = (key * 0x9E3779B97F4A7C15) & MASK64
+    else:
+        data = _key_bytes(key)
+        h = 0
+        for pos in range(0, len(data), 8):
+            word = int.from_bytes(data[pos:pos + 8], 'little')
+            h = ((h ^ word) * 0x9E3779B97F4A7C15) & MASK64
+    return h >> 31
+
+TABULATION_POSITIONS = 32
+
+def make_tabulation_hash(seed=None):
+    # Таблица случайных чисел на каждую позицию байта; хеш - XOR по байтам ключа.
+    # После каждого блока из TABULATION_POSITIONS байт хеш сдвигается циклически,
+    # иначе одинаковые байты на позициях i и i + TABULATION_POSITIONS взаимно гасятся
+    rng = random.Random(seed)
+    tables = [[rng.getrandbits(63) for _ in range(256)] for _ in range(TABULATION_POSITIONS)]
+
+    def tabulation_hash(key):
+        h = 0
+        for i, b in enumerate(_key_bytes(key)):
+            pos = i % TABULATION_POSITIONS
+            if pos == 0 and i:
+                h = ((h << 1) | (h >> 62)) & MASK63
+            h ^= tables[pos][b]
+        return h
+    return tabulation_hash
+
+def _rotl(x, b):
+    return ((x << b) | (x >> (64 - b))) & MASK64
+
+def siphash24(k0, k1, data):
+    # SipHash-2-4 с 128-битным ключом (k0, k1)
+    v0 = k0 ^ 0x736f6d6570736575
+    v1 = k1 ^ 0x646f72616e646f6d
+    v2 = k0 ^ 0x6c7967656e657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def sipround(v0, v1, v2, v3):
+        v0 = (v0 + v1) & MASK64; v1 = _rotl(v1, 13) ^ v0; v0 = _rotl(v0, 32)
+        v2 = (v2 + v3) & MASK64; v3 = _rotl(v3, 16) ^ v2
+        v0 = (v0 + v3) & MASK64; v3 = _rotl(v3, 21) ^ v0
+        v2 = (v2 + v1) & MASK64; v1 = _rotl(v1, 17) ^ v2; v2 = _rotl(v2, 32)
+        return v0, v1, v2, v3
+
+    tail = len(data) % 8
+    blocks = [int.from_bytes(data[pos:pos + 8], 'little') for pos in range(0, len(data) - tail, 8)]
+    # Последний блок: остаток байтов и длина сообщения в старшем байте
+    blocks.append(int.from_bytes(data[len(data) - tail:], 'little') | ((len(data) & 0xff) << 56))
+    for m in blocks:
+        v3 ^= m
+        v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+        v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+        v0 ^= m
+
+    v2 ^= 0xff
+    for _ in range(4):
+        v0, v1, v2, v3 = sipround(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+def make_keyed_hash(seed=None):
+    # Секретный ключ не дает заранее подобрать ключи с одинаковым хешем
+    rng = random.Random(seed)
+    k0, k1 = rng.getrandbits(64), rng.getrandbits(64)
+
+    def keyed_hash(key):
+        return siphash24(k0, k1, _key_bytes(key)) & MASK63
+    return keyed_hash
+
+# Метка удаленного слота: поиск идет дальше нее, вставка может ее занять
+DELETED = object()
+
 class HashTable:
-    def __init__(self, method='linear'):
+    def __init__(self, method='linear', incremental=False, max_load_factor=0.7,
+                 max_collision_rate=1.0, rehash_step=8, max_tombstone_ratio=0.2,
+                 hash_func=None):
         self.size = 16
         self.count = 0
-        self.slots = [None] * self.size
-        self.method = method  # 'linear' или 'quadratic'
+        self.method = method  # 'linear', 'quadratic' или 'robinhood'
+        self.hash_func = hash_func or hash  # Любая функция ключ -> int, см. _hash
+
+        # Слоты хранятся в параллельных массивах вместо кортежа на элемент:
+        # hashes - сохраненные хеши, keys (None - пусто, DELETED - удален),
+        # values и dists - смещения от домашней ячейки (только для robinhood)
+        self.hashes, self.keys, self.values, self.dists = self._new_arrays(self.size)
         
-        # Параметры для расширения
+        # Параметры для расширения: таблица растет, если заполненность (вместе
+        # с метками удаления) превышает max_load_factor или коллизий с прошлой
+        # перестройки больше, чем max(M, max_collision_rate * вставок за то же время)
         self.collision_threshold = 50  # Порог коллизий (M)
+        self.max_load_factor = max_load_factor
+        self.max_collision_rate = max_collision_rate
         self.total_collisions = 0
+        self.lifetime_collisions = 0  # Коллизии до последней перестройки
+        self.recent_inserts = 0
+        self.resize_count = 0
+
+        # Удаленные слоты удлиняют цепочки проб, поэтому при доле меток выше
+        # max_tombstone_ratio таблица перестраивается без изменения размера
+        self.tombstones = 0
+        self.max_tombstone_ratio = max_tombstone_ratio
+        self.compact_count = 0
+        self.total_probes = 0  # Сколько слотов просмотрено операциями пользователя
+        self.rebuild_probes = 0  # ...и переносом элементов при перестройках
+
+        # Постепенное расширение: старые массивы переносятся в новые
+        # по rehash_step элементов за каждую операцию вместо одного длинного прохода
+        self.incremental = incremental
+        self.rehash_step = rehash_step
+        self.old = None  # (hashes, keys, values, dists) старой таблицы
+        self.migrate_pos = 0
     
+    def _new_arrays(self, size):
+        hashes = array('q', bytes(8 * size))
+        dists = array('i', bytes(4 * size)) if self.method == 'robinhood' else None
+        return hashes, [None] * size, [None] * size, dists
+
     def _hash(self, key):
-        return hash(key)
+        # Результат обрезается до 63 бит, чтобы любая функция помещалась в array('q')
+        return self.hash_func(key) & MASK63
 
-    def _get_index(self, key_hash, i):
+    def _get_index(self, key_hash, i, size=None):
+        size = size or self.size
         if self.method == 'quadratic':
-            return (key_hash + i + i**2) % self.size
-        return (key_hash + i) % self.size  # Linear
+            # Треугольные числа: при размере-степени двойки обходят все слоты
+            return (key_hash + (i + i * i) // 2) % size
+        return (key_hash + i) % size  # Linear и Robin Hood
 
-    def _resize(self):
-        old_slots = self.slots
-        self.size *= 2
-        self.slots = [None] * self.size
-        self.count = 0
+    def _needs_resize(self):
+        if self.count + self.tombstones + 1 > self.max_load_factor * self.size:
+            return True
+        # Если хеши ключей совпадают, рост почти пустой таблицы не поможет
+        if (self.count + 1) * 8 < self.size:
+            return False
+        return self.total_collisions > max(self.collision_threshold,
+                                           self.max_collision_rate * self.recent_inserts)
+
+    def _rebuild(self, size):
+        # Заводит новые массивы из size слотов и возвращает старые.
+        # Незаконченный перенос доделывается до начала следующей перестройки
+        if self.old is not None:
+            self._migrate(len(self.old[1]))
+
+        old = (self.hashes, self.keys, self.values, self.dists)
+        self.size = size
+        self.hashes, self.keys, self.values, self.dists = self._new_arrays(size)
+        self.lifetime_collisions += self.total_collisions
         self.total_collisions = 0
-        
-        for item in old_slots:
-            if item is not None:
-                self.insert(item[0], item[1], resize_mode=True)
+        self.recent_inserts = 0
+        self.tombstones = 0
+        return old
 
-    def insert(self, key, value, resize_mode=False):
-        # Проверка порога коллизий перед вставкой (если не в режиме ресайза)
-        if not resize_mode and self.total_collisions > self.collision_threshold:
-            self._resize()
+    def _reinsert(self, old, start, limit=None):
+        # Перенос живых элементов old, начиная с позиции start: всех или первых
+        # limit штук. Хеш берется сохраненный. Возвращает позицию продолжения.
+        # Пробы переноса учитываются отдельно от проб обычных операций
+        hashes, keys, values = old[0], old[1], old[2]
+        size = len(keys)
+        probes_before = self.total_probes
+        moved = 0
+        pos = start
+        while pos < size and moved != limit:
+            key = keys[pos]
+            if key is not None and key is not DELETED:
+                self._place(key, values[pos], hashes[pos], count_collisions=False)
+                moved += 1
+            pos += 1
+        self.rebuild_probes += self.total_probes - probes_before
+        self.total_probes = probes_before
+        return pos
 
-        key_hash = self._hash(key)
+    def _resize(self):
+        old = self._rebuild(self.size * 2)
+        self.resize_count += 1
+
+        if self.incremental:
+            self.old = old
+            self.migrate_pos = 0
+            return
+        self._reinsert(old, 0)
+
+    def _compact(self):
+        old = self._rebuild(self.size)
+        self.compact_count += 1
+        self._reinsert(old, 0)
+
+    def _migrate(self, steps):
+        # За один вызов переносится не больше steps элементов;
+        # пустые ячейки пропускаются без счета
+        self.migrate_pos = self._reinsert(self.old, self.migrate_pos, steps)
+        if self.migrate_pos == len(self.old[1]):
+            self.old = None
+
+    def _place(self, key, value, key_hash, count_collisions=True):
+        # Ставит пару в текущие массивы. True - ключ новый, False - обновлен
+        if self.method == 'robinhood':
+            return self._place_robinhood(key, value, key_hash, count_collisions)
+        hashes, keys = self.hashes, self.keys
+        free = -1  # Первая встреченная метка удаления
         i = 0
         while i < self.size:
             idx = self._get_index(key_hash, i)
-            slot = self.slots[idx]
+            slot_key = keys[idx]
+            self.total_probes += 1
 
-            # Если слот пуст
-            if slot is None:
-                self.slots[idx] = (key, value)
-                self.count += 1
-                return True
-            
-            # Если ключ совпадает (обновление)
-            if slot[0] == key:
-                self.slots[idx] = (key, value)
-                return True
-            
+            # Если слот пуст, ключа в таблице нет
+            if slot_key is None:
+                if free == -1:
+                    free = idx
+                break
+
+            if slot_key is DELETED:
+                if free == -1:
+                    free = idx
+            # Если ключ совпадает (обновление). Ключи сравниваются, только
+            # если совпали хеши
+            elif hashes[idx] == key_hash and (slot_key is key or slot_key == key):
+                self.values[idx] = value
+                return False
             # Коллизия
-            if not resize_mode:
+            elif count_collisions:
                 self.total_collisions += 1
             i += 1
+
+        if free == -1:
+            raise RuntimeError("В таблице нет свободных слотов")
+        if keys[free] is DELETED:
+            self.tombstones -= 1
+        hashes[free] = key_hash
+        keys[free] = key
+        self.values[free] = value
+        return True
+
+    def _place_robinhood(self, key, value, key_hash, count_collisions=True):
+        # Вставляемый элемент забирает слот у элемента с меньшим смещением
+        # от домашней ячейки, а тот продолжает поиск места дальше
+        hashes, keys, values, dists = self.hashes, self.keys, self.values, self.dists
+        idx = key_hash % self.size
+        carry_hash, carry_key, carry_value, dist = key_hash, key, value, 0
+        for _ in range(self.size):
+            slot_key = keys[idx]
+            self.total_probes += 1
+
+            if slot_key is None:
+                hashes[idx], keys[idx], values[idx], dists[idx] = carry_hash, carry_key, carry_value, dist
+                return True
+
+            # До первого обмена ищем сам ключ: дальше слота с меньшим
+            # смещением он стоять не может
+            if (carry_key is key and hashes[idx] == key_hash
+                    and (slot_key is key or slot_key == key)):
+                values[idx] = value
+                return False
+
+            if count_collisions:
+                self.total_collisions += 1
+            if dists[idx] < dist:
+                carry_hash, hashes[idx] = hashes[idx], carry_hash
+                carry_key, keys[idx] = slot_key, carry_key
+                carry_value, values[idx] = values[idx], carry_value
+                dist, dists[idx] = dists[idx], dist
+            dist += 1
+            idx = (idx + 1) % self.size
+        raise RuntimeError("В таблице нет свободных слотов")
+
+    def _remove_robinhood(self, idx):
+        # Удаление обратным сдвигом: следующие элементы цепочки сдвигаются
+        # на одну ячейку к дому, поэтому метки удаления не нужны
+        hashes, keys, values, dists = self.hashes, self.keys, self.values, self.dists
+        nxt = (idx + 1) % self.size
+        while keys[nxt] is not None and dists[nxt] > 0:
+            hashes[idx], keys[idx], values[idx] = hashes[nxt], keys[nxt], values[nxt]
+            dists[idx] = dists[nxt] - 1
+            idx = nxt
+            nxt = (nxt + 1) % self.size
+        keys[idx] = None
+        values[idx] = None
+
+    def _find(self, table, key, key_hash):
+        # Индекс ключа в таблице (hashes, keys, values, dists) или -1
+        hashes, keys, dists = table[0], table[1], table[3]
+        size = len(keys)
+        i = 0
+        while i < size:
+            idx = self._get_index(key_hash, i, size)
+            slot_key = keys[idx]
+            self.total_probes += 1
             
-        # Если таблица заполнилась (редкий случай)
-        if not resize_mode:
+            if slot_key is None:
+                return -1
+            if slot_key is not DELETED:
+                if hashes[idx] == key_hash and (slot_key is key or slot_key == key):
+                    return idx
+                # Robin Hood: у искомого ключа смещение было бы не меньше i
+                if dists is not None and dists[idx] < i:
+                    return -1
+            i += 1
+        return -1
+
+    def _table(self):
+        return self.hashes, self.keys, self.values, self.dists
+
+    def insert(self, key, value):
+        if self.old is not None:
+            self._migrate(self.rehash_step)
+        if self._needs_resize():
             self._resize()
-            self.insert(key, value)
-        return False
+        key_hash = self._hash(key)
+
+        # Ключ, еще не перенесенный из старой таблицы (его позиция не меньше
+        # migrate_pos), обновляется на месте; остальные ключи живут в новой
+        if self.old is not None:
+            idx = self._find(self.old, key, key_hash)
+            if idx >= self.migrate_pos:
+                self.old[2][idx] = value
+                return True
+
+        self.recent_inserts += 1
+        if self._place(key, value, key_hash):
+            self.count += 1
+        return True
 
     def search(self, key):
+        if self.old is not None:
+            self._migrate(self.rehash_step)
         key_hash = self._hash(key)
-        i = 0
-        while i < self.size:
-            idx = self._get_index(key_hash, i)
-            slot = self.slots[idx]
-            
-            if slot is None:
-                return None
-            if slot[0] == key:
-                return slot[1]
-            i += 1
+
+        idx = self._find(self._table(), key, key_hash)
+        if idx != -1:
+            return self.values[idx]
+        if self.old is not None:
+            idx = self._find(self.old, key, key_hash)
+            if idx != -1:
+                return self.old[2][idx]
         return None
 
+    def delete(self, key):
+        if self.old is not None:
+            self._migrate(self.rehash_step)
+        key_hash = self._hash(key)
+
+        found = False
+        idx = self._find(self._table(), key, key_hash)
+        if idx != -1:
+            if self.method == 'robinhood':
+                self._remove_robinhood(idx)
+            else:
+                self.keys[idx] = DELETED
+                self.values[idx] = None
+                self.tombstones += 1
+            found = True
+        # В старой таблице копию тоже нужно пометить, иначе поиск найдет ее.
+        # Сдвигать ее нельзя: элементы перешли бы в уже перенесенную часть
+        if self.old is not None:
+            idx = self._find(self.old, key, key_hash)
+            if idx != -1:
+                self.old[1][idx] = DELETED
+                self.old[2][idx] = None
+                found = True
+        if not found:
+            return False
+
+        self.count -= 1
+        if self.tombstones > self.max_tombstone_ratio * self.size:
+            self._compact()
+        return True
+
+    def memory_per_entry(self):
+        # Байт на элемент под саму таблицу (без объектов ключей и значений)
+        total = sys.getsizeof(self.hashes) + sys.getsizeof(self.keys) + sys.getsizeof(self.values)
+        if self.dists is not None:
+            total += sys.getsizeof(self.dists)
+        return total / max(self.count, 1)
+
 # --- Вспомогательные функции ---
 
 def generate_random_keys(count):
     # Генерируем строки
     return [''.join(random.choices(string.ascii_letters, k=8)) for _ in range(count)]
 
+def generate_sequential_keys(count):
+    return list(range(count))
+
+def generate_prefix_keys(count, prefix='user:session:'):
+    # Длинный общий префикс, различаются только последние символы
+    return [f"{prefix}{i:08d}" for i in range(count)]
+
+def generate_adversarial_keys(count, stride=2 ** 20):
+    # Для встроенного hash (у int это само число) все ключи попадают в одну
+    # ячейку любой таблицы размером до stride
+    return [i * stride for i in range(count)]
+
+HASH_FUNCTIONS = {
+    'builtin': hash,
+    'fnv1a': fnv1a_hash,
+    'fibonacci': fibonacci_hash,
+    'tabulation': make_tabulation_hash(seed=1),
+    'siphash': make_keyed_hash(),
+}
+
+KEY_SETS = {
+    'random': generate_random_keys,
+    'sequential': generate_sequential_keys,
+    'prefix': generate_prefix_keys,
+    'adversarial': generate_adversarial_keys,
+}
+
 def benchmark():
     # Размеры: 100, 1100, 2100 ...
     sizes = array('i', range(100, 5000, 200))
     
     times_linear = array('d')
     times_quad = array('d')
+    # Байт на элемент: параллельные массивы и прежняя раскладка
+    # "список слотов + кортеж (key, value) на элемент" для сравнения
+    memory_arrays = array('d')
+    memory_tuples = array('d')
     
     for n in sizes:
         keys = generate_random_keys(n)
@@ -113,8 +463,122 @@ def benchmark():
         for k in keys:
             ht_quad.insert(k, k)
         times_quad.append(time.perf_counter() - t0)
+
+        memory_arrays.append(ht_lin.memory_per_entry())
+        tuples_total = sys.getsizeof([None] * ht_lin.size) + ht_lin.count * sys.getsizeof((k, k))
+        memory_tuples.append(tuples_total / ht_lin.count)
         
-    return sizes, times_linear, times_quad
+    return sizes, times_linear, times_quad, memory_arrays, memory_tuples
+
+def percentile(sorted_values, q):
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+def benchmark_latency(n=50000):
+    # Задержка каждой отдельной вставки: при расширении за один проход
+    # редкие вставки ждут перенос всей таблицы, что видно по p99 и максимуму
+    keys = generate_random_keys(n)
+    results = {}
+    for method in ['linear', 'quadratic']:
+        for incremental in [False, True]:
+            ht = HashTable(method=method, incremental=incremental)
+            latencies = array('d')
+            for k in keys:
+                t0 = time.perf_counter()
+                ht.insert(k, k)
+                latencies.append(time.perf_counter() - t0)
+            latencies = sorted(latencies)
+            results[(method, incremental)] = (percentile(latencies, 0.5),
+                                              percentile(latencies, 0.99),
+                                              latencies[-1])
+    return results
+
+def benchmark_churn(n=20000, operations=200000, window=10000, compact=True):
+    # Смешанная нагрузка: таблица держится около n элементов, ключи постоянно
+    # удаляются и добавляются. Средняя длина пробы считается по окнам операций
+    ht = HashTable(method='linear',
+                   max_tombstone_ratio=0.2 if compact else float('inf'))
+    keys = generate_random_keys(n)
+    for k in keys:
+        ht.insert(k, k)
+    # Дальше размер не меняется: иначе расширение тоже убирает метки,
+    # и запуск без перестройки перестает быть базовым
+    ht.max_load_factor = float('inf')
+    ht.max_collision_rate = float('inf')
+    ht.collision_threshold = float('inf')
+    ht.rebuild_probes = 0
+
+    points = array('i')
+    avg_probes = array('d')
+    probes_before = ht.total_probes
+    t0 = time.perf_counter()
+    for op in range(1, operations + 1):
+        r = random.random()
+        pos = random.randrange(n)
+        if r < 0.5:
+            ht.search(keys[pos])
+        else:
+            # Удаление с последующей вставкой нового ключа на то же место
+            ht.delete(keys[pos])
+            keys[pos] = ''.join(random.choices(string.ascii_letters, k=8))
+            ht.insert(keys[pos], pos)
+        if op % window == 0:
+            points.append(op)
+            avg_probes.append((ht.total_probes - probes_before) / window)
+            probes_before = ht.total_probes
+    elapsed = time.perf_counter() - t0
+    return points, avg_probes, elapsed, ht
+
+def probe_stats(ht, keys):
+    # Средняя и максимальная длина пробы при поиске каждого ключа из keys
+    lengths = array('i')
+    for k in keys:
+        before = ht.total_probes
+        ht.search(k)
+        lengths.append(ht.total_probes - before)
+    return sum(lengths) / len(lengths), max(lengths)
+
+def benchmark_probe_lengths(size_log=14, load_factors=(0.5, 0.6, 0.7, 0.8, 0.9)):
+    # Таблица фиксированного размера 2**size_log заполняется до нужной доли;
+    # расширение по коллизиям отключено, чтобы сравнивать методы при одной загрузке
+    methods = ['linear', 'quadratic', 'robinhood']
+    results = {m: {'hit_mean': array('d'), 'hit_max': array('i'),
+                   'miss_mean': array('d'), 'miss_max': array('i')} for m in methods}
+    for lf in load_factors:
+        n = int(lf * 2 ** size_log)
+        keys = generate_random_keys(n)
+        missing = generate_random_keys(n // 4)
+        for method in methods:
+            ht = HashTable(method=method, max_load_factor=0.95,
+                           max_collision_rate=float('inf'))
+            ht.collision_threshold = float('inf')
+            for k in keys:
+                ht.insert(k, k)
+            hit_mean, hit_max = probe_stats(ht, keys)
+            miss_mean, miss_max = probe_stats(ht, missing)
+            results[method]['hit_mean'].append(hit_mean)
+            results[method]['hit_max'].append(hit_max)
+            results[method]['miss_mean'].append(miss_mean)
+            results[method]['miss_max'].append(miss_max)
+    return load_factors, results
+
+def benchmark_matrix(n=2000):
+    # Все сочетания (хеш-функция, пробирование, набор ключей):
+    # вставок в секунду, коллизий за все время и длина пробы при поиске
+    rows = []
+    for dataset, generate in KEY_SETS.items():
+        keys = generate(n)
+        for hash_name, hash_func in HASH_FUNCTIONS.items():
+            for method in ['linear', 'quadratic', 'robinhood']:
+                ht = HashTable(method=method, hash_func=hash_func)
+                t0 = time.perf_counter()
+                for k in keys:
+                    ht.insert(k, k)
+                elapsed = time.perf_counter() - t0
+                mean_probe, max_probe = probe_stats(ht, keys)
+                rows.append((dataset, hash_name, method, n / elapsed,
+                             ht.lifetime_collisions + ht.total_collisions,
+                             mean_probe, max_probe))
+    return rows
 
 # --- Демонстрация ---
 def print_example():
@@ -129,13 +593,25 @@ def print_example():
     print(f"Total Collisions: {ht.total_collisions}")
     print(f"Table Size: {ht.size}")
 
+    ht.delete("banana")
+    print(f"Delete 'banana' -> search: {ht.search('banana')}, tombstones: {ht.tombstones}")
+
+    ht_inc = HashTable(method='quadratic', incremental=True)
+    for i in range(100):
+        ht_inc.insert(f"key{i}", i)
+    print(f"Incremental: search 'key42' -> {ht_inc.search('key42')}, "
+          f"resizes: {ht_inc.resize_count}, size: {ht_inc.size}")
+
 if __name__ == "__main__":
     print_example()
     
     print("\n--- Запуск тестов производительности ---")
-    sizes, times_lin, times_quad = benchmark()
+    sizes, times_lin, times_quad, memory_arrays, memory_tuples = benchmark()
+    print(f"Память на элемент при N={sizes[-1]}: массивы {memory_arrays[-1]:.1f} байт, "
+          f"кортежи {memory_tuples[-1]:.1f} байт")
     
-    plt.figure(figsize=(10, 6))
+    plt.figure(figsize=(16, 6))
+    plt.subplot(1, 2, 1)
     
     # График для Linear
     plt.plot(sizes, times_lin, label='Linear Probing', marker='o', markersize=4)
@@ -154,5 +630,59 @@ if __name__ == "__main__":
     plt.title('Сложность вставки в Хеш-таблицу')
     plt.legend()
     plt.grid(True)
+
+    plt.subplot(1, 2, 2)
+    plt.plot(sizes, memory_arrays, label='Параллельные массивы', marker='o', markersize=4)
+    plt.plot(sizes, memory_tuples, label='Кортеж на элемент', marker='x', markersize=4)
+    plt.xlabel('Количество элементов (N)')
+    plt.ylabel('Байт на элемент')
+    plt.title('Память таблицы на элемент')
+    plt.legend()
+    plt.grid(True)
     
     plt.savefig('hashtable_plot.png')
+
+    print("\n--- Задержка одной вставки (мкс) ---")
+    for (method, incremental), (p50, p99, worst) in benchmark_latency().items():
+        mode = 'incremental' if incremental else 'stop-the-world'
+        print(f"{method:<10} {mode:<15} p50={p50 * 1e6:7.2f}  p99={p99 * 1e6:7.2f}  max={worst * 1e6:9.2f}")
+
+    print("\n--- Смешанная нагрузка вставка/удаление/поиск ---")
+    plt.figure(figsize=(10, 6))
+    for compact in [True, False]:
+        points, avg_probes, elapsed, ht = benchmark_churn(compact=compact)
+        label = 'С перестройкой' if compact else 'Без перестройки'
+        print(f"{label}: {elapsed:.2f} с, перестроек: {ht.compact_count}, "
+              f"проб на перестройки: {ht.rebuild_probes}, "
+              f"меток удаления: {ht.tombstones}, размер: {ht.size}")
+        plt.plot(points, avg_probes, label=label, marker='o', markersize=4)
+    plt.xlabel('Выполнено операций')
+    plt.ylabel('Средняя длина пробы (слотов)')
+    plt.title('Длина пробы при удалениях с метками')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('hashtable_churn_plot.png')
+
+    print("\n--- Длина пробы: linear / quadratic / robinhood ---")
+    load_factors, probes = benchmark_probe_lengths()
+    fig, (ax_mean, ax_max) = plt.subplots(1, 2, figsize=(14, 6))
+    for method, stats in probes.items():
+        print(f"{method:<10} успешный поиск: mean={stats['hit_mean'][-1]:.2f} max={stats['hit_max'][-1]:4d}  "
+              f"неуспешный: mean={stats['miss_mean'][-1]:.2f} max={stats['miss_max'][-1]:4d}")
+        ax_mean.plot(load_factors, stats['hit_mean'], label=f'{method} (найден)', marker='o', markersize=4)
+        ax_mean.plot(load_factors, stats['miss_mean'], label=f'{method} (не найден)', linestyle='--')
+        ax_max.plot(load_factors, stats['hit_max'], label=f'{method} (найден)', marker='o', markersize=4)
+        ax_max.plot(load_factors, stats['miss_max'], label=f'{method} (не найден)', linestyle='--')
+    ax_mean.set_title('Средняя длина пробы')
+    ax_max.set_title('Максимальная длина пробы')
+    for ax in (ax_mean, ax_max):
+        ax.set_xlabel('Коэффициент заполнения')
+        ax.set_ylabel('Слотов просмотрено')
+        ax.legend()
+        ax.grid(True)
+    fig.savefig('hashtable_probe_plot.png')
+
+    print("\n--- Хеш-функции и наборы ключей ---")
+    print(f"{'dataset':<12}{'hash':<12}{'method':<11}{'inserts/s':>11}{'collisions':>12}{'mean probe':>12}{'max probe':>11}")
+    for dataset, hash_name, method, rate, collisions, mean_probe, max_probe in benchmark_matrix():
+        print(f"{dataset:<12}{hash_name:<12}{method:<11}{rate:>11.0f}{collisions:>12d}{mean_probe:>12.2f}{max_probe:>11d}")
@@ -1,24 +1,84 @@
 #Реализуй класс бинарного дерева Tree с использованием класса узла Node и функцию для нахождения путей от корня до листа, сумма значений узлов которых в диапазоне [a, b], за один обход дерева. Проверьте работу функции на различных конфигурациях деревьев.
 
+import time
+import random
+from array import array
+from collections import deque
+
+
 class Node:
     def __init__(self, value):
         self.value = value
         self.left = None
         self.right = None
+        # Минимальная и максимальная сумма пути от этого узла до листа его поддерева
+        self.min_sum = value
+        self.max_sum = value
 
 
 class Tree:
     def __init__(self, root=None):
         self.root = root
 
+    # Вставка как в BST; суммы min_sum/max_sum пересчитываются снизу вверх
+    # только вдоль пути вставки и только пока они меняются.
+    def insert(self, value):
+        new_node = Node(value)
+        if self.root is None:
+            self.root = new_node
+            return
+
+        path = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            current = current.left if value < current.value else current.right
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+        for node in reversed(path):
+            if not update_path_sums(node):
+                break
+
+
+def update_path_sums(node):
+    children = [child for child in (node.left, node.right) if child is not None]
+    if children:
+        new_min = node.value + min(child.min_sum for child in children)
+        new_max = node.value + max(child.max_sum for child in children)
+    else:
+        new_min = new_max = node.value
+    changed = new_min != node.min_sum or new_max != node.max_sum
+    node.min_sum = new_min
+    node.max_sum = new_max
+    return changed
+
+
+def annotate_path_sums(root):
+    # Прямой обход в обратном порядке: дети всегда обрабатываются раньше родителя
+    order = []
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if node.left:
+            stack.append(node.left)
+        if node.right:
+            stack.append(node.right)
+    for node in reversed(order):
+        update_path_sums(node)
+
 def build_tree_from_list(values):
     if not values:
         return Tree()
     root = Node(values[0])
-    queue = [root]
+    queue = deque([root])
     i = 1
     while i < len(values):
-        node = queue.pop(0)
+        node = queue.popleft()
         if i < len(values) and values[i] is not None:
             node.left = Node(values[i])
             queue.append(node.left)
@@ -27,37 +87,146 @@ def build_tree_from_list(values):
             node.right = Node(values[i])
             queue.append(node.right)
         i += 1
+    annotate_path_sums(root)
     return Tree(root)
 
 
-def find_paths_in_sum_range(root, a, b):
+# Прямой режим без объектов Node: индексы детей каждой позиции обхода по уровням.
+# Родителями по очереди становятся непустые позиции (как в очереди построителя),
+# а их дети занимают следующие позиции списка. NIL - потомка нет.
+NIL = -1
+
+
+def level_order_children(values):
+    n = len(values)
+    left = array('q', [NIL]) * n
+    right = array('q', [NIL]) * n
+    parent = 0
+    i = 1
+    while i < n:
+        while parent < i and values[parent] is None:
+            parent += 1
+        if parent >= i:
+            raise ValueError("Список не является корректным обходом дерева по уровням")
+        if values[i] is not None:
+            left[parent] = i
+        i += 1
+        if i < n and values[i] is not None:
+            right[parent] = i
+        i += 1
+        parent += 1
+    return left, right
+
+
+# Обход в глубину на явном стеке пар (узел, глубина) вместо рекурсии.
+# Генератор отдает (leaf, depth, path) для листьев на глубине из [low, high]
+# (в ребрах); путь от корня - path[:depth + 1]. Буфер path общий для всех
+# листьев и действителен до следующего шага. Узлы глубже high не посещаются.
+def traverse(root, low=0, high=None, path=None):
+    if root is None:
+        return
+    if path is None:
+        path = []
+    limit = float('inf') if high is None else high
+    stack = [(root, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, depth = pop()
+        # Левый потомок обрабатывается сразу, в стек кладется только правый
+        while depth <= limit:
+            try:
+                path[depth] = node.value
+            except IndexError:
+                path.append(node.value)
+            left, right = node.left, node.right
+            if left is None:
+                if right is None:
+                    if depth >= low:
+                        yield node, depth, path
+                    break
+                node = right
+            else:
+                if right is not None:
+                    push((right, depth + 1))
+                node = left
+            depth += 1
+
+
+def find_paths_in_sum_range(root, a, b, indexed=False):
 
     if root is None:
         return []
+    if indexed:
+        return find_paths_in_sum_range_indexed(root, a, b)
 
+    result = []
+    for _, depth, current_path in traverse(root):
+        path = current_path[:depth + 1]
+        if a <= sum(path) <= b:
+            result.append(path)
+    return result
+
+
+# Поиск с отсечением по min_sum/max_sum: поддерево пропускается целиком, если
+# ни один путь через него не может попасть в [a, b]. Требует актуальных сумм
+# (build_tree_from_list, Tree.insert или annotate_path_sums).
+def find_paths_in_sum_range_indexed(root, a, b):
     result = []
     current_path = []
-    current_sum = 0
+    stack = [(root, 0, 0)]
+    while stack:
+        node, depth, prefix_sum = stack.pop()
+        if prefix_sum + node.max_sum < a or prefix_sum + node.min_sum > b:
+            continue
 
-    def dfs(node):
-        nonlocal current_sum
+        del current_path[depth:]
         current_path.append(node.value)
-        current_sum += node.value
+        current_sum = prefix_sum + node.value
 
         if node.left is None and node.right is None:
+            result.append(current_path.copy())
+            continue
+        if node.right:
+            stack.append((node.right, depth + 1, current_sum))
+        if node.left:
+            stack.append((node.left, depth + 1, current_sum))
+    return result
+
+
+# То же самое прямо по списку обхода по уровням, без построения узлов
+def find_paths_in_sum_range_levels(values, a, b):
+    if not values or values[0] is None:
+        return []
+
+    left, right = level_order_children(values)
+    result = []
+    current_path = []
+    stack = [(0, 0, 0)]
+    while stack:
+        i, depth, prefix_sum = stack.pop()
+        del current_path[depth:]
+        current_path.append(values[i])
+        current_sum = prefix_sum + values[i]
+
+        if left[i] == NIL and right[i] == NIL:
             if a <= current_sum <= b:
                 result.append(current_path.copy())
-        else:
-            if node.left:
-                dfs(node.left)
-            if node.right:
-                dfs(node.right)
+            continue
+        if right[i] != NIL:
+            stack.append((right[i], depth + 1, current_sum))
+        if left[i] != NIL:
+            stack.append((left[i], depth + 1, current_sum))
+    return result
 
-        current_path.pop()
-        current_sum -= node.value
 
-    dfs(root)
-    return result
+# Потоковый вариант: пути выдаются по мере нахождения, без общего списка результатов,
+# так что вызывающий может остановиться на первом найденном или просто посчитать их.
+def iter_paths_in_sum_range(root, a, b):
+    for _, depth, current_path in traverse(root):
+        path = current_path[:depth + 1]
+        if a <= sum(path) <= b:
+            yield path
 
 
 def print_paths(paths):
@@ -93,3 +262,77 @@ test_tree("Пустое дерево", tree3.root, 0, 100)
 tree4 = build_tree_from_list([-2, -5, 3, -8, None, None, 1])
 test_tree("Дерево с отрицательными числами, диапазон [-10, -5]", tree4.root, -10, -5)
 test_tree("Дерево с отрицательными числами, диапазон [0, 5]", tree4.root, 0, 5)
+
+#прямой режим по списку уровней
+print("\nПрямой режим, диапазон [15, 25]:",
+      find_paths_in_sum_range_levels([10, 5, 12, 3, 7, None, 15], 15, 25))
+
+#потоковый поиск: только первый подходящий путь
+first = next(iter_paths_in_sum_range(build_tree_from_list([10, 5, 12, 3, 7, None, 15]).root, 15, 25), None)
+print(f"\nПервый путь с суммой в [15, 25]: {first}")
+
+
+def benchmark_indexed(size=50000, queries=20):
+    tree = Tree()
+    for _ in range(size):
+        tree.insert(random.randint(-1000, 1000000))
+
+    # Узкие диапазоны у верхней границы сумм: подходят лишь немногие пути
+    top = tree.root.max_sum
+    ranges = [(top - random.randint(0, 100000), top) for _ in range(queries)]
+
+    t0 = time.perf_counter()
+    full = [find_paths_in_sum_range(tree.root, a, b) for a, b in ranges]
+    full_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pruned = [find_paths_in_sum_range(tree.root, a, b, indexed=True) for a, b in ranges]
+    pruned_time = time.perf_counter() - t0
+
+    assert full == pruned
+    print(f"\nN={size}, запросов: {queries}")
+    print(f"Полный обход: {full_time:.4f} сек, с отсечением: {pruned_time:.4f} сек "
+          f"(ускорение x{full_time / pruned_time:.1f})")
+
+
+
+def random_level_order(size, none_prob=0.1):
+    # Случайный корректный обход по уровням: None ставится только в свободное
+    # место под существующим родителем, последнее свободное место не пустеет
+    values = [0]
+    free = 2
+    while len(values) < size:
+        if free > 1 and random.random() < none_prob:
+            values.append(None)
+            free -= 1
+        else:
+            values.append(random.randint(-100, 100))
+            free += 1
+    return values
+
+
+def benchmark_level_order(size=1000000, a=-50, b=50):
+    # Одинаковый запрос с обеих сторон: через узлы в замер входят построение
+    # дерева (вместе с annotate_path_sums) и обход, напрямую - индексы детей и обход
+    values = random_level_order(size)
+
+    t0 = time.perf_counter()
+    via_nodes = find_paths_in_sum_range(build_tree_from_list(values).root, a, b)
+    nodes_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    direct = find_paths_in_sum_range_levels(values, a, b)
+    direct_time = time.perf_counter() - t0
+
+    assert via_nodes == direct
+    print(f"\nСписок из {size} элементов, диапазон [{a}, {b}], путей: {len(direct)}")
+    print(f"Построение узлов + поиск: {nodes_time:.3f} сек, "
+          f"поиск прямо по списку: {direct_time:.3f} сек")
+
+
+if __name__ == "__main__":
+    #индексированный поиск на большом дереве
+    benchmark_indexed()
+
+    #построение по уровням на большом списке
+    benchmark_level_order()
\ No newline at end of file
@@ -1,5 +1,8 @@
 #Реализуйте класс бинарного дерева Tree с использованием класса узла Node и функцию для нахождения путей от корня до листа одинаковой длины за один обход дерева (возвращает длину пути и сами пути). Проверьте работу функции на различных конфигурациях деревьев.
 
+from array import array
+from collections import deque
+
 class Node:
     def __init__(self, value):
         self.value = value
@@ -17,10 +20,10 @@ def build_tree_from_list(values):
     if not values:
         return Tree()
     root = Node(values[0])
-    queue = [root]
+    queue = deque([root])
     i = 1
     while i < len(values):
-        node = queue.pop(0)
+        node = queue.popleft()
         if i < len(values) and values[i] is not None:
             node.left = Node(values[i])
             queue.append(node.left)
@@ -32,33 +35,111 @@ def build_tree_from_list(values):
     return Tree(root)
 
 
+# Прямой режим без объектов Node: индексы детей каждой позиции обхода по уровням.
+# Родителями по очереди становятся непустые позиции (как в очереди построителя),
+# а их дети занимают следующие позиции списка. NIL - потомка нет.
+NIL = -1
+
+
+def level_order_children(values):
+    n = len(values)
+    left = array('q', [NIL]) * n
+    right = array('q', [NIL]) * n
+    parent = 0
+    i = 1
+    while i < n:
+        while parent < i and values[parent] is None:
+            parent += 1
+        if parent >= i:
+            raise ValueError("Список не является корректным обходом дерева по уровням")
+        if values[i] is not None:
+            left[parent] = i
+        i += 1
+        if i < n and values[i] is not None:
+            right[parent] = i
+        i += 1
+        parent += 1
+    return left, right
+
+
+# Обход в глубину на явном стеке пар (узел, глубина) вместо рекурсии.
+# Генератор отдает (leaf, depth, path) для листьев на глубине из [low, high]
+# (в ребрах); путь от корня - path[:depth + 1]. Буфер path общий для всех
+# листьев и действителен до следующего шага. Узлы глубже high не посещаются.
+def traverse(root, low=0, high=None, path=None):
+    if root is None:
+        return
+    if path is None:
+        path = []
+    limit = float('inf') if high is None else high
+    stack = [(root, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, depth = pop()
+        # Левый потомок обрабатывается сразу, в стек кладется только правый
+        while depth <= limit:
+            try:
+                path[depth] = node.value
+            except IndexError:
+                path.append(node.value)
+            left, right = node.left, node.right
+            if left is None:
+                if right is None:
+                    if depth >= low:
+                        yield node, depth, path
+                    break
+                node = right
+            else:
+                if right is not None:
+                    push((right, depth + 1))
+                node = left
+            depth += 1
+
+
 def find_paths_grouped_by_length(root):
     if root is None:
         return {}
 
     result = {}
-    current_path = []
-
-    def dfs(node):
-        current_path.append(node.value)
+    for _, depth, current_path in traverse(root):
+        length = depth + 1
+        if length not in result:
+            result[length] = []
+        result[length].append(current_path[:length])
+    return result
 
-        if node.left is None and node.right is None:
-            length = len(current_path)
-            if length not in result:
-                result[length] = []
-            result[length].append(current_path.copy())
-        else:
-            if node.left:
-                dfs(node.left)
-            if node.right:
-                dfs(node.right)
 
-        current_path.pop()
+# Группировка по длине прямо по списку обхода по уровням, без узлов
+def find_paths_grouped_by_length_levels(values):
+    if not values or values[0] is None:
+        return {}
 
-    dfs(root)
+    left, right = level_order_children(values)
+    result = {}
+    current_path = []
+    stack = [(0, 0)]
+    while stack:
+        i, depth = stack.pop()
+        del current_path[depth:]
+        current_path.append(values[i])
+
+        if left[i] == NIL and right[i] == NIL:
+            result.setdefault(depth + 1, []).append(current_path.copy())
+            continue
+        if right[i] != NIL:
+            stack.append((right[i], depth + 1))
+        if left[i] != NIL:
+            stack.append((left[i], depth + 1))
     return result
 
 
+# Потоковый вариант: пары (длина, путь) выдаются по одной, без словаря всех путей.
+def iter_paths_with_length(root):
+    for _, depth, current_path in traverse(root):
+        yield depth + 1, current_path[:depth + 1]
+
+
 def print_paths_by_length(paths_dict):
     if not paths_dict:
         print("  Нет путей (дерево пусто)")
@@ -94,3 +175,13 @@ test_tree("Дерево с отрицательными числами", tree4.r
 #вырожденное дерево (одна ветвь)
 tree5 = build_tree_from_list([1, None, 2, None, 3, None, 4])
 test_tree("Вырожденное дерево (справа)", tree5.root)
+
+#прямой режим по списку уровней, без узлов
+print("\nПрямой режим, вырожденное дерево:")
+print_paths_by_length(find_paths_grouped_by_length_levels([1, None, 2, None, 3, None, 4]))
+
+#потоковый обход: считаем пути по длинам, не храня сами пути
+counts = {}
+for length, _ in iter_paths_with_length(build_tree_from_list([10, 5, 12, 3, 7, None, 15]).root):
+    counts[length] = counts.get(length, 0) + 1
+print(f"\nКоличество путей по длинам: {counts}")
\ No newline at end of file
@@ -2,6 +2,7 @@ import sys
 import time
 import random
 from array import array
+from collections import OrderedDict
 import matplotlib.pyplot as plt
 
 sys.setrecursionlimit(20000)
@@ -11,18 +12,94 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        # Число узлов от этого узла до ближайшего и до самого дальнего листа (без него самого)
+        self.min_leaf = 0
+        self.max_leaf = 0
+
+class QueryCache:
+    """
+    LRU-кэш результатов запросов к дереву. Ключ - (вид запроса, параметры).
+    Ответы привязаны к версии дерева: при каждом insert версия растет,
+    и при следующем обращении кэш целиком сбрасывается.
+    Сохраненные результаты отдаются как есть: функция запроса сама возвращает
+    наружу их полную копию, чтобы изменения результата не попадали в кэш.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, version, compute):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        result = compute()
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+def build_balanced(values, start, end):
+    """Сбалансированное BST из отсортированного отрезка values[start..end] за O(N)"""
+    if start > end:
+        return None
+
+    mid = (start + end) // 2
+
+    node = Node(values[mid])
+    node.left = build_balanced(values, start, mid - 1)
+    node.right = build_balanced(values, mid + 1, end)
+    update_leaf_depths(node)
+    return node
+
+def update_leaf_depths(node):
+    """Пересчитывает min_leaf/max_leaf по детям; возвращает True, если они изменились"""
+    children = [child for child in (node.left, node.right) if child is not None]
+    if children:
+        min_leaf = min(child.min_leaf for child in children) + 1
+        max_leaf = max(child.max_leaf for child in children) + 1
+    else:
+        min_leaf = max_leaf = 0
+    changed = min_leaf != node.min_leaf or max_leaf != node.max_leaf
+    node.min_leaf = min_leaf
+    node.max_leaf = max_leaf
+    return changed
 
 class Tree:
-    def __init__(self):
+    def __init__(self, cache_size=128):
         self.root = None
+        self.version = 0
+        self.cache = QueryCache(cache_size)
+
+    @classmethod
+    def from_iterable(cls, values, presorted=False):
+        values = list(values) if presorted else sorted(values)
+        tree = cls()
+        tree.root = build_balanced(values, 0, len(values) - 1)
+        return tree
 
     def insert(self, value):
+        self.version += 1
         if self.root is None:
             self.root = Node(value)
             return
         
+        path = []
         current = self.root
         while True:
+            path.append(current)
             if value < current.value:
                 if current.left is None:
                     current.left = Node(value)
@@ -34,33 +111,83 @@ class Tree:
                     break
                 current = current.right
 
-def find_paths_recursive(node, target_length, current_path, flat_results):
-    current_path.append(node.value)
-    
-    if node.left is None and node.right is None:
-        if len(current_path) == target_length:
-            flat_results.extend(current_path)
-    else:
-        if node.left:
-            find_paths_recursive(node.left, target_length, current_path, flat_results)
-        if node.right:
-            find_paths_recursive(node.right, target_length, current_path, flat_results)
-            
-    current_path.pop()
+        # Глубины листьев могли измениться только у предков нового узла
+        for node in reversed(path):
+            if not update_leaf_depths(node):
+                break
+
+def traverse(root, low=0, high=None, path=None):
+    """
+    Итеративный обход в глубину на стеке пар (узел, глубина), без рекурсии.
+    Генератор отдает (leaf, depth, path) для листьев на глубине из [low, high]
+    (в ребрах), путь от корня - path[:depth + 1]. Буфер path общий для всех
+    листьев; можно передать свой, например array('i') нужной длины.
+    Поддеревья, где нет листьев с такой глубиной, отсекаются по min_leaf/max_leaf.
+    """
+    if root is None:
+        return
+    if high is None:
+        high = root.max_leaf
+    if path is None:
+        path = [None] * (root.max_leaf + 1)
+    prune = low > root.min_leaf or high < root.max_leaf
+    stack = [(root, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, depth = pop()
+        # Левый потомок обрабатывается сразу, в стек кладется только правый
+        while True:
+            if prune and (depth + node.max_leaf < low or depth + node.min_leaf > high):
+                break
+            path[depth] = node.value
+            left, right = node.left, node.right
+            if left is None:
+                if right is None:
+                    yield node, depth, path
+                    break
+                node = right
+            else:
+                if right is not None:
+                    push((right, depth + 1))
+                node = left
+            depth += 1
 
 def get_paths_equal_length(tree, target_length):
-    current_path = array('i')
+    length, flat_results, count = tree.cache.get_or_compute(
+        ('equal_length', target_length), tree.version,
+        lambda: _get_paths_equal_length(tree, target_length))
+    # Копия массива: изменения результата не должны попасть в кэш
+    return length, flat_results[:], count
+
+def _get_paths_equal_length(tree, target_length):
     flat_results = array('i')
-    
-    if tree.root is not None:
-        find_paths_recursive(tree.root, target_length, current_path, flat_results)
-    
-    if target_length > 0:
-        count = len(flat_results) // target_length
-    else:
-        count = 0
-        
-    return target_length, flat_results, count
+    if target_length <= 0:
+        return target_length, flat_results, 0
+
+    # Все выданные листья на глубине target_length - 1, путь занимает весь буфер
+    buffer = array('i', bytes(4 * target_length))
+    last = target_length - 1
+    for _ in traverse(tree.root, last, last, buffer):
+        flat_results.extend(buffer)
+    return target_length, flat_results, len(flat_results) // target_length
+
+def iter_paths_equal_length(tree, target_length, copy=True):
+    """
+    Генератор путей из target_length узлов без накопления результата.
+    Путь пишется в буфер array('i') фиксированной длины: узлы глубже
+    target_length не могут дать подходящий лист и не посещаются.
+    По умолчанию отдается копия буфера; при copy=False - memoryview на него
+    без копирования, действительный только до следующего шага генератора.
+    """
+    if tree.root is None or target_length <= 0:
+        return
+
+    buffer = array('i', bytes(4 * target_length))
+    view = memoryview(buffer)
+    last = target_length - 1
+    for _ in traverse(tree.root, last, last, buffer):
+        yield buffer[:] if copy else view
 
 def generate_random_tree(size):
     t = Tree()
@@ -107,6 +234,16 @@ def print_example():
         p = flat_paths[start_index : end_index]
         print(f"Path {i+1}: {p}")
 
+    get_paths_equal_length(t, target)
+    print(f"Cache stats: {t.cache.stats()}")
+
+    streamed = sum(1 for _ in iter_paths_equal_length(t, target, copy=False))
+    print(f"Streamed count: {streamed}")
+
+    bulk = Tree.from_iterable([20, 8, 1, 15, 5, 10, 30])
+    length, flat_paths, count = get_paths_equal_length(bulk, target)
+    print(f"from_iterable, paths of length {length}: {count}")
+
 if __name__ == "__main__":
     print_example()
     